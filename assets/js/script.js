@@ -5,6 +5,9 @@ class UniQuestChatbot {
         this.sendButton = document.getElementById('sendButton');
         this.chatMessages = document.getElementById('chatMessages');
         this.typingIndicator = document.getElementById('typingIndicator');
+        this.suggestionList = document.getElementById('suggestionList');
+        this.suggestTimer = null;
+        this.suggestDelay = 150; // ms to wait after the last keystroke
         
         this.initializeEventListeners();
         this.showWelcomeMessage();
@@ -36,6 +39,41 @@ class UniQuestChatbot {
             this.messageInput.style.height = 'auto';
             this.messageInput.style.height = this.messageInput.scrollHeight + 'px';
         });
+
+        // Typeahead suggestions (debounced)
+        this.messageInput.addEventListener('input', () => {
+            clearTimeout(this.suggestTimer);
+            this.suggestTimer = setTimeout(() => this.updateSuggestions(), this.suggestDelay);
+        });
+    }
+
+    async updateSuggestions() {
+        if (!this.suggestionList) return;
+
+        // Suggest for the word being typed, keeping the rest of the message
+        const value = this.messageInput.value;
+        const prefix = value.split(/\s+(?:in|for|at|near|offering)\s+/i).pop().trim();
+        if (prefix.length < 2) {
+            this.suggestionList.innerHTML = '';
+            return;
+        }
+
+        try {
+            const response = await fetch(`${this.apiUrl}/suggest?prefix=${encodeURIComponent(prefix)}&limit=8`);
+            if (!response.ok) return;
+
+            const data = await response.json();
+            const head = value.slice(0, value.length - prefix.length);
+            this.suggestionList.innerHTML = '';
+            (data.suggestions || []).forEach(suggestion => {
+                const option = document.createElement('option');
+                option.value = head + suggestion.text;
+                option.label = suggestion.type;
+                this.suggestionList.appendChild(option);
+            });
+        } catch (error) {
+            // Suggestions are optional; ignore network errors
+        }
     }
 
     showWelcomeMessage() {
@@ -107,6 +145,10 @@ class UniQuestChatbot {
             throw new Error(data.error);
         }
 
+        if (data.corrected_query) {
+            return `Showing results for "${data.corrected_query}"\n\n${data.response}`;
+        }
+
         return data.response;
     }
 
@@ -0,0 +1 @@
+# Lets pytest import the uniquest package from backend/tests
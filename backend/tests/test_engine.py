@@ -0,0 +1,89 @@
+import os
+import re
+import threading
+
+import pandas as pd
+import pytest
+
+from uniquest.deadline import Deadline
+from uniquest.engine import DEFAULT_DATA_DIR, MultiDatasetCollegeChatbot
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists(os.path.join(DEFAULT_DATA_DIR, 'Engineering.csv')),
+    reason='needs the course dataset in data/',
+)
+
+
+@pytest.fixture(scope='module')
+def bot():
+    bot = MultiDatasetCollegeChatbot()
+    bot.ensure_loaded()
+    return bot
+
+
+def test_requests_during_the_first_load_wait_for_it():
+    bot = MultiDatasetCollegeChatbot()
+    started = threading.Event()
+    original_load = bot.load
+
+    def slow_load():
+        started.set()
+        original_load()
+
+    bot.load = slow_load
+    loader = threading.Thread(target=bot.run_search, args=('cse colleges in kerala',))
+    loader.start()
+    started.wait()
+    results, errors = [], []
+
+    def search():
+        try:
+            results.append((bot.run_search('colleges in karnataka')['result_count'], bot.suggest('iit')))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads + [loader]:
+        thread.join()
+    assert errors == []
+    assert all(count > 0 and suggestions for count, suggestions in results)
+
+
+@pytest.mark.parametrize('query', [
+    'colleges in kerala',
+    'cse colleges in karnataka',
+    'top 10 colleges in tamil nadu',
+    'cse or ece colleges in karnataka not private',
+])
+def test_exports_cover_every_answered_college(bot, query):
+    answered = bot.run_search(query)['result_count']
+    export, dataset = bot.export(query)
+    rows = pd.concat(list(export.chunks()))
+    keys = set(bot.matched_college_keys(dataset, rows)) & set(bot.college_profiles.index)
+    assert len(keys) == answered > 0
+
+
+def test_exported_rows_keep_the_asked_state(bot):
+    export, dataset = bot.export('cse colleges in karnataka')
+    rows = pd.concat(list(export.chunks()))
+    assert dataset == 'courses'
+    assert set(rows['State'].str.lower()) == {'karnataka'}
+
+
+def test_course_answers_name_the_college_of_each_row(bot):
+    result = bot.run_search('computer science colleges')
+    names = re.findall(r'^\d+\. \*\*(.+?)\*\*', result['response'], re.M | re.S)
+    assert result['branch'] == 'course'
+    assert names and set(names) <= set(result['matches']['college name'])
+
+
+def test_spent_budget_still_lists_the_colleges_found(bot):
+    rows = bot.run_search('computer science colleges')['matches']
+    names = rows['college name'].unique()[:5]
+    deadline = Deadline(0)
+    assert deadline.expired('format')
+    response = bot.format_course_results(names, rows, 'computer science colleges', deadline)
+    assert '(5 colleges)' in response
+    assert all(f'**{name}**' in response for name in names)
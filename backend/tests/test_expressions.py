@@ -0,0 +1,90 @@
+import numpy as np
+
+from uniquest.expressions import (
+    BitmapIndex, ExpressionCache, Term, TYPE_PHRASES, parse_expression, tokenize,
+)
+
+PHRASES = {
+    'computer science': ('course', 'computer science'),
+    'cse': ('course', 'computer science'),
+    'ece': ('course', 'electronics'),
+    'civil': ('course', 'civil'),
+    'tamil nadu': ('location', 'tamil nadu'),
+    'kerala': ('location', 'kerala'),
+    **{phrase: ('type', value) for phrase, value in TYPE_PHRASES.items()},
+}
+
+
+def compile_query(query):
+    return parse_expression(tokenize(query, PHRASES))
+
+
+def token_keys(query):
+    return [token.key() if isinstance(token, Term) else token for token in tokenize(query, PHRASES)]
+
+
+def test_tokenize_prefers_longest_phrase_and_drops_filler():
+    assert token_keys('Computer Science colleges in Tamil Nadu') == [
+        'course:computer science', 'location:tamil nadu',
+    ]
+
+
+def test_tokenize_splits_hyphenated_negation():
+    assert token_keys('non-government colleges') == ['not', 'type:government']
+
+
+def test_tokenize_turns_unknown_words_into_one_gap():
+    assert token_keys('cse with good placements') == ['course:computer science', 'and', '?']
+
+
+def test_or_binds_tighter_than_not_and_and():
+    expression = compile_query('cse or ece not in tamil nadu or kerala')
+    assert str(expression) == '(computer science or electronics) and not (tamil nadu or kerala)'
+
+
+def test_parentheses_group_terms():
+    expression = compile_query('(civil or cse) and (kerala or tamil nadu) but not private')
+    assert str(expression) == '(civil or computer science) and (kerala or tamil nadu) and not private'
+
+
+def test_not_without_a_known_term_negates_nothing():
+    expression = compile_query('colleges without hostel in kerala')
+    assert str(expression) == 'kerala'
+    assert not expression.is_boolean
+
+
+def test_query_without_terms_compiles_to_none():
+    assert compile_query('show me some colleges') is None
+
+
+def test_key_ignores_operand_order():
+    assert compile_query('ece or cse').key == compile_query('CSE or ECE colleges').key
+
+
+def test_positive_values_leave_out_negated_terms():
+    expression = compile_query('cse but not civil')
+    assert expression.positive_values('course') == ['computer science']
+    assert expression.attributes() == {'course'}
+
+
+def test_courses_are_combined_per_college_and_places_per_row():
+    # Rows are programs; college 0 offers cse and ece, college 1 only cse,
+    # and college 0 has a second campus outside Kerala
+    index = BitmapIndex([0, 0, 1, 0])
+    index.add('course', ['computer science', 'electronics', 'computer science', 'civil'])
+    index.add('location', [['kerala'], ['kerala'], ['tamil nadu'], ['tamil nadu']])
+
+    assert compile_query('cse and ece').mask('courses', index).tolist() == [True, True, False, True]
+    assert compile_query('cse not in kerala').mask('courses', index).tolist() == [False, False, True, True]
+    assert compile_query('ece in kerala').mask('courses', index).tolist() == [True, True, False, False]
+    assert index.row_mask('course', ['electronics']).tolist() == [False, True, False, False]
+
+
+def test_expression_cache_reuses_and_evicts():
+    cache = ExpressionCache(max_entries=2)
+    first = cache.get('a', lambda: compile_query('cse'))
+    assert cache.get('a', lambda: compile_query('ece')) is first
+    cache.get('b', lambda: compile_query('ece'))
+    cache.get('c', lambda: compile_query('civil'))
+    assert 'a' not in cache.entries
+    assert cache.stats() == {'expressions': 2, 'hits': 1, 'misses': 3}
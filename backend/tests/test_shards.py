@@ -0,0 +1,10 @@
+from uniquest.shards import ShardCoordinator
+
+
+def test_coordinator_corrects_places_before_routing():
+    coordinator = ShardCoordinator(['http://shard-0', 'http://shard-1'])
+    coordinator._locations = {0: {'bangalore', 'karnataka'}, 1: {'kerala'}}
+    corrected, corrections = coordinator.correct_query('colleges in banglore')
+    assert corrected == 'colleges in bangalore'
+    assert corrections == [{'original': 'banglore', 'corrected': 'bangalore'}]
+    assert coordinator.route(coordinator.parse_intent(corrected)) == [0]
@@ -0,0 +1,35 @@
+"""UniQuest college search engine.
+
+Importing the package is cheap: pandas, numpy and Flask are only imported
+when the engine or the web app is first used, and the datasets are loaded
+lazily by the engine on first query.
+"""
+
+import threading
+
+__all__ = ['MultiDatasetCollegeChatbot', 'create_app', 'get_chatbot']
+
+_shared_chatbot = None
+_shared_lock = threading.Lock()
+
+
+def get_chatbot():
+    """Return the process-wide chatbot instance, creating it on first call"""
+    global _shared_chatbot
+    if _shared_chatbot is None:
+        with _shared_lock:
+            if _shared_chatbot is None:
+                from .engine import MultiDatasetCollegeChatbot
+                _shared_chatbot = MultiDatasetCollegeChatbot()
+    return _shared_chatbot
+
+
+def __getattr__(name):
+    # Resolve the heavy modules only when their names are first used
+    if name == 'MultiDatasetCollegeChatbot':
+        from .engine import MultiDatasetCollegeChatbot
+        return MultiDatasetCollegeChatbot
+    if name == 'create_app':
+        from .app import create_app
+        return create_app
+    raise AttributeError(f"module 'uniquest' has no attribute '{name}'")
@@ -0,0 +1,212 @@
+import time
+
+from flask import Flask, Response, request, jsonify, render_template_string, stream_with_context
+from flask_cors import CORS
+
+from . import get_chatbot
+from .deadline import BudgetMetrics, resolve_budget_ms
+from .querylog import QueryLogger
+
+
+def create_app(chatbot=None, query_logger=None):
+    """Build the Flask application around a chatbot engine (the shared one by default).
+    
+    Query logging is configured from the environment unless a logger is passed.
+    """
+    if chatbot is None:
+        chatbot = get_chatbot()
+    if query_logger is None:
+        query_logger = QueryLogger.from_env()
+    
+    app = Flask(__name__)
+    CORS(app)
+    app.config['CHATBOT'] = chatbot
+    app.config['QUERY_LOGGER'] = query_logger
+    budget_metrics = BudgetMetrics()
+    app.config['BUDGET_METRICS'] = budget_metrics
+    
+    @app.route('/')
+    def home():
+        return render_template_string("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>UniQuest Multi-Dataset College Chatbot API</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
+                .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+                h1 { color: #2c3e50; text-align: center; }
+                .dataset-info { background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 15px 0; }
+                .api-info { background: #e8f5e8; padding: 20px; border-radius: 5px; margin: 20px 0; }
+                code { background: #34495e; color: white; padding: 2px 5px; border-radius: 3px; }
+                .feature { margin: 10px 0; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <h1>🎓 UniQuest Multi-Dataset College Chatbot API</h1>
+                
+                <div class="dataset-info">
+                    <h3>📊 Integrated Datasets:</h3>
+                    <div class="feature">1. <strong>Detailed College Info</strong> - Fees, facilities, ratings, courses</div>
+                    <div class="feature">2. <strong>NIRF Rankings 2024</strong> - Official government rankings (Top 200+)</div>
+                    <div class="feature">3. <strong>Course-Specific Data</strong> - Individual program details and accreditations</div>
+                </div>
+                
+                <div class="api-info">
+                    <h3>🚀 Enhanced Capabilities:</h3>
+                    <div class="feature">• <strong>Smart Dataset Selection</strong> - Automatically chooses the best data source</div>
+                    <div class="feature">• <strong>Cross-Dataset Integration</strong> - Combines information from multiple sources</div>
+                    <div class="feature">• <strong>NIRF Ranking Queries</strong> - "Show top 10 colleges" or "colleges ranked 20-30"</div>
+                    <div class="feature">• <strong>Course-Specific Search</strong> - "Computer Science colleges" or "Mechanical engineering"</div>
+                    <div class="feature">• <strong>Detailed Filters</strong> - Fees, location, facilities, ratings</div>
+                </div>
+                
+                <div class="api-info">
+                    <h3>📡 API Usage:</h3>
+                    <p><strong>POST</strong> <code>/chat</code> - Send queries to the enhanced chatbot</p>
+                    <p><strong>Examples:</strong></p>
+                    <code>{"message": "Top 10 NIRF ranked colleges"}</code><br><br>
+                    <code>{"message": "Computer science colleges under 5 lakhs"}</code><br><br>
+                    <code>{"message": "Best colleges in Maharashtra with good facilities"}</code>
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+    @app.route('/chat', methods=['POST'])
+    def chat():
+        message = ''
+        started = time.perf_counter()
+        try:
+            data = request.get_json()
+            message = data.get('message', '').strip()
+            
+            if not message:
+                return jsonify({'error': 'No message provided'}), 400
+            
+            # Time budget: "budget_ms" from the client, capped by UNIQUEST_DEADLINE_MS
+            deadline = budget_metrics.start(resolve_budget_ms(data.get('budget_ms')), started)
+            
+            corrected_message, corrections = chatbot.correct_query(message)
+            deadline.expired('correct')
+            search = chatbot.run_search(corrected_message, deadline)
+            result = {'response': search['response'], 'partial': search['partial']}
+            if data.get('facets'):
+                result['total_matches'] = chatbot.matched_row_count(search)
+                try:
+                    result['facets'] = chatbot.facet_counts(search['dataset'], search['matches'])
+                except NotImplementedError as e:
+                    result['facets_unavailable'] = str(e)
+            if corrections:
+                result['corrected_query'] = corrected_message
+                result['corrections'] = corrections
+            
+            if query_logger is not None:
+                query_logger.log(
+                    message, search['intent'], search['branch'],
+                    search['result_count'], (time.perf_counter() - started) * 1000,
+                    corrected=corrected_message, partial=search['partial'],
+                )
+            return jsonify(result)
+        
+        except Exception as e:
+            if query_logger is not None and message:
+                query_logger.log(message, None, 'error', 0,
+                                 (time.perf_counter() - started) * 1000, status='error')
+            return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+    @app.route('/compare', methods=['POST'])
+    def compare():
+        try:
+            data = request.get_json()
+            names = data.get('colleges')
+            if not names and data.get('message'):
+                names = chatbot.extract_comparison_names(data['message'])
+            
+            if not names or not isinstance(names, list):
+                return jsonify({'error': 'Provide a list of college names in "colleges"'}), 400
+            
+            output_format = data.get('format', 'json')
+            result = chatbot.compare_colleges(names, output_format=output_format)
+            if output_format == 'markdown':
+                return jsonify({'response': result})
+            return jsonify(result)
+        
+        except Exception as e:
+            return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+    @app.route('/export', methods=['POST'])
+    def export():
+        try:
+            data = request.get_json()
+            message = data.get('message', '').strip()
+            if not message:
+                return jsonify({'error': 'No message provided'}), 400
+            
+            columns = data.get('columns')
+            if isinstance(columns, str):
+                columns = [column.strip() for column in columns.split(',') if column.strip()]
+            corrected_message, _ = chatbot.correct_query(message)
+            try:
+                rows, dataset = chatbot.export(corrected_message, data.get('format', 'csv'), columns,
+                                               data.get('chunk_rows', 1000))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except NotImplementedError as e:
+                return jsonify({'error': str(e)}), 501
+            
+            # Rows are encoded chunk by chunk while the response is sent
+            return Response(stream_with_context(rows.encode()), mimetype=rows.media_type, headers={
+                'Content-Disposition': f'attachment; filename="uniquest-{dataset}.{rows.extension}"',
+                'X-Export-Dataset': dataset,
+                'X-Export-Rows': str(len(rows)),
+            })
+        
+        except Exception as e:
+            return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+    @app.route('/shard/search', methods=['POST'])
+    def shard_search():
+        try:
+            data = request.get_json()
+            message = data.get('message', '').strip()
+            if not message:
+                return jsonify({'error': 'No message provided'}), 400
+
+            deadline = budget_metrics.start(resolve_budget_ms(data.get('budget_ms')))
+            corrected_message, _ = chatbot.correct_query(message)
+            return jsonify(chatbot.search_shard(corrected_message, int(data.get('limit', 10)), deadline))
+
+        except Exception as e:
+            return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+    @app.route('/shard/info', methods=['GET'])
+    def shard_info():
+        try:
+            return jsonify(chatbot.shard_info())
+
+        except Exception as e:
+            return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        result = {'deadlines': budget_metrics.snapshot()}
+        if hasattr(chatbot, 'fragment_stats'):
+            result['fragments'] = chatbot.fragment_stats()
+        if hasattr(chatbot, 'expression_cache'):
+            result['expressions'] = chatbot.expression_cache.stats()
+        return jsonify(result)
+    
+    @app.route('/suggest', methods=['GET'])
+    def suggest():
+        try:
+            prefix = request.args.get('prefix', '')
+            limit = request.args.get('limit', 8, type=int)
+            return jsonify({'prefix': prefix, 'suggestions': chatbot.suggest(prefix, limit)})
+        
+        except Exception as e:
+            return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+    
+    return app
@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def cmd_query(args):
+    from . import get_chatbot
+    chatbot = get_chatbot()
+    query, corrections = chatbot.correct_query(' '.join(args.query))
+    if corrections:
+        print(f"Showing results for \"{query}\"\n")
+    if args.facets:
+        result = chatbot.search_colleges_with_facets(query)
+        print(result['response'])
+        print(json.dumps({'total_matches': result['total_matches'], 'facets': result['facets']}, indent=2))
+    else:
+        print(chatbot.search_colleges(query))
+    return 0
+
+
+def cmd_export(args):
+    from . import get_chatbot
+    chatbot = get_chatbot()
+    query, _ = chatbot.correct_query(' '.join(args.query))
+    columns = [column.strip() for column in args.columns.split(',')] if args.columns else None
+    try:
+        rows, dataset = chatbot.export(query, args.format, columns, args.chunk_rows)
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for chunk in rows.encode():
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+    print(f"[SUCCESS] Exported {len(rows)} {dataset} row(s)", file=sys.stderr)
+    return 0
+
+
+def cmd_suggest(args):
+    from . import get_chatbot
+    for suggestion in get_chatbot().suggest(' '.join(args.prefix), args.limit):
+        print(f"{suggestion['text']}\t{suggestion['type']}")
+    return 0
+
+
+def cmd_compare(args):
+    from . import get_chatbot
+    output_format = 'json' if args.json else 'markdown'
+    result = get_chatbot().compare_colleges(args.colleges, output_format=output_format)
+    print(json.dumps(result, indent=2) if args.json else result)
+    return 0
+
+
+def cmd_replay(args):
+    from .querylog import read_query_log
+    from .replay import HttpTarget, InProcessTarget, format_report, replay, summarize
+    records = read_query_log(args.log)
+    if args.limit:
+        records = records[:args.limit]
+    if args.target:
+        target = HttpTarget(args.target)
+    else:
+        from . import get_chatbot
+        target = InProcessTarget(get_chatbot())
+    
+    started = time.perf_counter()
+    results = replay(records, target, speed=args.speed, concurrency=args.concurrency)
+    summary = summarize(results, time.perf_counter() - started)
+    print(json.dumps(summary, indent=2) if args.json else format_report(summary))
+    return 1 if summary.get('all', {}).get('errors') else 0
+
+
+def cmd_serve(args):
+    from .app import create_app
+    chatbot = None
+    if args.data_dir:
+        from .engine import MultiDatasetCollegeChatbot
+        chatbot = MultiDatasetCollegeChatbot(args.data_dir)
+    print("Starting UniQuest Multi-Dataset College Chatbot...")
+    create_app(chatbot).run(debug=args.debug, host=args.host, port=args.port)
+    return 0
+
+
+def cmd_shard_split(args):
+    from . import get_chatbot
+    from .shards import split_datasets
+    chatbot = get_chatbot()
+    chatbot.ensure_loaded()
+    for manifest in split_datasets(chatbot, args.out, args.shards, by=args.by):
+        print(f"shard-{manifest['shard']}: {', '.join(manifest['partitions'])} {manifest['rows']}")
+    return 0
+
+
+def cmd_coordinator(args):
+    from .app import create_app
+    from .shards import ShardCoordinator
+    coordinator = ShardCoordinator(args.shard, timeout=args.timeout)
+    coordinator.ensure_loaded()
+    print(f"Starting UniQuest coordinator over {len(args.shard)} shard(s)...")
+    create_app(coordinator).run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+def cmd_cluster(args):
+    import subprocess
+    import tempfile
+    import urllib.request
+    from .app import create_app
+    from .shards import ShardCoordinator
+
+    out = args.out or tempfile.mkdtemp(prefix='uniquest-shards-')
+    cmd_shard_split(argparse.Namespace(out=out, shards=args.shards, by=args.by))
+
+    processes, urls = [], []
+    for shard in range(args.shards):
+        port = args.port + 1 + shard
+        processes.append(subprocess.Popen([
+            sys.executable, '-m', 'uniquest.cli', 'serve', '--host', '127.0.0.1', '--port', str(port),
+            '--data-dir', os.path.join(out, f'shard-{shard}'),
+        ], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        urls.append(f'http://127.0.0.1:{port}')
+    try:
+        # Wait until every shard has loaded its slice and answers
+        for url in urls:
+            for _ in range(600):
+                try:
+                    urllib.request.urlopen(url + '/shard/info', timeout=30).read()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        print(f"Starting UniQuest coordinator over {len(urls)} local shard(s)...")
+        create_app(ShardCoordinator(urls)).run(host=args.host, port=args.port, threaded=True)
+    finally:
+        for process in processes:
+            process.terminate()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='uniquest', description='UniQuest college search')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    query = commands.add_parser('query', help='Answer a chat query')
+    query.add_argument('query', nargs='+')
+    query.add_argument('--facets', action='store_true', help='Also print match and facet counts')
+    query.set_defaults(func=cmd_query)
+
+    export = commands.add_parser('export', help='Export every row matching a query')
+    export.add_argument('query', nargs='+')
+    export.add_argument('--format', choices=['csv', 'ndjson', 'parquet'], default='csv')
+    export.add_argument('--columns', help='Comma-separated columns to keep (default: all)')
+    export.add_argument('--output', '-o', help='File to write (default: stdout)')
+    export.add_argument('--chunk-rows', type=int, default=1000, help='Rows encoded per chunk')
+    export.set_defaults(func=cmd_export)
+
+    suggest = commands.add_parser('suggest', help='Typeahead suggestions for a prefix')
+    suggest.add_argument('prefix', nargs='+')
+    suggest.add_argument('--limit', type=int, default=8)
+    suggest.set_defaults(func=cmd_suggest)
+
+    compare = commands.add_parser('compare', help='Compare colleges side by side')
+    compare.add_argument('colleges', nargs='+')
+    compare.add_argument('--json', action='store_true', help='Print JSON instead of a markdown table')
+    compare.set_defaults(func=cmd_compare)
+
+    replay = commands.add_parser('replay', help='Replay a captured query log and report latencies')
+    replay.add_argument('log', help='Query log written with UNIQUEST_QUERY_LOG')
+    replay.add_argument('--target', help='Base URL of a running server (default: in-process engine)')
+    mode = replay.add_mutually_exclusive_group()
+    mode.add_argument('--speed', type=float, help='Replay at recorded arrival times, N times faster')
+    mode.add_argument('--concurrency', type=int, help='Number of concurrent clients (default 1)')
+    replay.add_argument('--limit', type=int, help='Only replay the first N records')
+    replay.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    replay.set_defaults(func=cmd_replay)
+
+    serve = commands.add_parser('serve', help='Run the web API')
+    serve.add_argument('--host', default='0.0.0.0')
+    serve.add_argument('--port', type=int, default=5000)
+    serve.add_argument('--debug', action='store_true')
+    serve.add_argument('--data-dir', help='Serve the datasets in this directory (e.g. one shard)')
+    serve.set_defaults(func=cmd_serve)
+
+    split = commands.add_parser('shard-split', help='Partition the datasets into shard data directories')
+    split.add_argument('out', help='Directory to write shard-0, shard-1, ... into')
+    split.add_argument('--shards', type=int, default=2)
+    split.add_argument('--by', choices=['region', 'state'], default='region')
+    split.set_defaults(func=cmd_shard_split)
+
+    coordinator = commands.add_parser('coordinator', help='Serve the API by scatter-gather over shard nodes')
+    coordinator.add_argument('--shard', action='append', required=True, help='Base URL of a shard (repeat)')
+    coordinator.add_argument('--host', default='0.0.0.0')
+    coordinator.add_argument('--port', type=int, default=5000)
+    coordinator.add_argument('--timeout', type=float, default=30, help='Seconds to wait for a shard')
+    coordinator.set_defaults(func=cmd_coordinator)
+
+    cluster = commands.add_parser('cluster', help='Split the datasets and run local shards behind a coordinator')
+    cluster.add_argument('--shards', type=int, default=2)
+    cluster.add_argument('--by', choices=['region', 'state'], default='region')
+    cluster.add_argument('--out', help='Shard data directory (default: a temporary directory)')
+    cluster.add_argument('--host', default='127.0.0.1')
+    cluster.add_argument('--port', type=int, default=5000, help='Coordinator port; shards use the next ports')
+    cluster.set_defaults(func=cmd_cluster)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
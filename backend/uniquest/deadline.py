@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+
+
+class Deadline:
+    """Time budget for one request, checked cooperatively by the search loops.
+
+    `expired(stage)` is cheap to call inside loops; the first stage that
+    finds the budget spent is remembered so responses can be marked partial
+    and the overrun counted per stage.
+    """
+
+    def __init__(self, budget_ms=None, metrics=None, started=None):
+        self.budget_ms = budget_ms
+        self.started = time.perf_counter() if started is None else started
+        self.expires_at = None if budget_ms is None else self.started + budget_ms / 1000.0
+        self.exceeded_stage = None
+        self.metrics = metrics
+
+    @property
+    def exceeded(self):
+        return self.exceeded_stage is not None
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def remaining_ms(self):
+        """Budget left in milliseconds, or None when there is no budget"""
+        if self.budget_ms is None:
+            return None
+        return max(0.0, self.budget_ms - self.elapsed_ms())
+
+    def expired(self, stage):
+        """Whether the budget is spent; records `stage` as the first one to overrun"""
+        if self.exceeded_stage is not None:
+            return True
+        if self.expires_at is None or time.perf_counter() < self.expires_at:
+            return False
+        self.exceeded_stage = stage
+        if self.metrics is not None:
+            self.metrics.record_exceeded(stage)
+        return True
+
+
+def never_expires():
+    """A deadline with no budget, for callers that did not ask for one"""
+    return Deadline(None)
+
+
+class BudgetMetrics:
+    """Counts of requests run with a time budget and of budgets exceeded, per stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests_with_budget = 0
+        self.budget_exceeded = 0
+        self.exceeded_by_stage = {}
+
+    def start(self, budget_ms, started=None):
+        """Create a deadline for a request, counting it when it has a budget"""
+        if budget_ms is not None:
+            with self._lock:
+                self.requests_with_budget += 1
+        return Deadline(budget_ms, metrics=self, started=started)
+
+    def record_exceeded(self, stage):
+        with self._lock:
+            self.budget_exceeded += 1
+            self.exceeded_by_stage[stage] = self.exceeded_by_stage.get(stage, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests_with_budget': self.requests_with_budget,
+                'budget_exceeded': self.budget_exceeded,
+                'exceeded_by_stage': dict(self.exceeded_by_stage),
+            }
+
+
+def resolve_budget_ms(requested_ms, environ=None):
+    """Effective budget for a request.
+
+    UNIQUEST_DEADLINE_MS sets the default budget (unset means no budget) and
+    also caps what a client may ask for; a client may always ask for less.
+    """
+    environ = os.environ if environ is None else environ
+    configured = environ.get('UNIQUEST_DEADLINE_MS')
+    configured = float(configured) if configured else None
+    if requested_ms is None:
+        return configured
+    requested_ms = max(0.0, float(requested_ms))
+    return requested_ms if configured is None else min(requested_ms, configured)
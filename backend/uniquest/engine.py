@@ -0,0 +1,1390 @@
+import os
+import re
+import sys
+import threading
+
+import pandas as pd
+
+from .deadline import never_expires
+from .export import DEFAULT_CHUNK_ROWS, Export
+from .expressions import (
+    ACCREDITATION_PHRASES, CATEGORY_PHRASES, TYPE_PHRASES, BitmapIndex, ExpressionCache,
+    parse_expression, tokenize,
+)
+from .facets import FacetIndex
+from .fragments import FragmentCache, dataset_generation
+from .planner import Predicate, QueryPlanner
+from .profiles import CollegeResolver, build_college_profiles, college_rows
+from .ranges import SortedRangeIndex
+from .shards import DATASET_FILES, college_scores, read_shard_manifest
+from .spelling import QUERY_VOCABULARY, SymSpellCorrector
+from .suggest import SuggestionIndex, clean_place, clean_text, name_aliases
+
+# <repo>/data, next to the backend directory; override with UNIQUEST_DATA_DIR
+DEFAULT_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data'
+)
+
+class MultiDatasetCollegeChatbot:
+    # Cities and states recognised in queries
+    LOCATIONS = [
+        'mumbai', 'delhi', 'bangalore', 'bengaluru', 'chennai', 'kolkata', 'hyderabad', 
+        'pune', 'ahmedabad', 'surat', 'jaipur', 'lucknow', 'kanpur', 'nagpur', 'patna',
+        'indore', 'thane', 'bhopal', 'visakhapatnam', 'vadodara', 'firozabad', 'coimbatore',
+        'madurai', 'kochi', 'thiruvananthapuram', 'bhubaneswar', 'guwahati', 'chandigarh',
+        'maharashtra', 'karnataka', 'tamil nadu', 'kerala', 'andhra pradesh', 'telangana',
+        'gujarat', 'rajasthan', 'uttar pradesh', 'west bengal', 'bihar', 'odisha',
+        'punjab', 'haryana', 'madhya pradesh', 'jharkhand', 'assam', 'uttarakhand',
+        'chhattisgarh', 'puducherry'
+    ]
+    
+    # Course mappings
+    COURSE_MAPPINGS = {
+        'computer science': ['computer science', 'cse', 'computer engineering'],
+        'mechanical': ['mechanical engineering', 'mechanical'],
+        'electrical': ['electrical', 'electrical and electronics'],
+        'electronics': ['electronics', 'ece', 'electronics and communication'],
+        'civil': ['civil engineering', 'civil'],
+        'chemical': ['chemical engineering', 'chemical'],
+        'biotechnology': ['biotechnology', 'biotech'],
+        'information technology': ['information technology', 'it'],
+        'aerospace': ['aerospace', 'aeronautical'],
+        'automobile': ['automobile', 'automotive']
+    }
+    
+    FACILITIES = ['hostel', 'gym', 'library', 'sports', 'cafeteria', 'wifi', 'medical', 'swimming pool']
+    
+    RANKING_WORDS = ['rank', 'top', 'nirf', 'best ranked']
+    FEE_WORDS = ['fee', 'fees', 'cost', 'cheap', 'expensive', 'budget', 'affordable']
+    RATING_WORDS = ['best', 'highest rated', 'rating', 'excellent']
+    
+    # Attributes populated by load(); reading any of them loads the datasets
+    LAZY_ATTRIBUTES = frozenset([
+        'df_main', 'df_nirf', 'df_courses', 'suggestion_index', 'spell_corrector',
+        'college_profiles', 'college_rows', 'college_resolver', 'facet_indexes', 'row_keys', 'row_course_groups',
+        'query_planner', 'range_indexes', 'college_fragments', 'dataset_generation', 'bitmap_indexes',
+    ])
+    
+    # Colleges whose rendered fragments are built at load time (by NIRF rank, then programs)
+    FRAGMENT_WARM_COLLEGES = 200
+    
+    def __init__(self, data_dir=None):
+        """Create the chatbot without touching the disk; datasets load on first use"""
+        self.data_dir = data_dir or os.environ.get('UNIQUEST_DATA_DIR') or DEFAULT_DATA_DIR
+        self._loaded = False
+        self._loading = False
+        self._load_lock = threading.RLock()
+        # Query parsing needs no data, so a coordinator can compile queries too
+        self.expression_phrases = self.build_expression_phrases()
+        self.expression_cache = ExpressionCache()
+    
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. before the datasets are loaded
+        if name in MultiDatasetCollegeChatbot.LAZY_ATTRIBUTES:
+            self.ensure_loaded()
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+    
+    def ensure_loaded(self):
+        """Load the datasets and build the indexes once, on first use.
+        
+        Public entry points call this too: while another thread is loading,
+        the attributes already exist (so __getattr__ does not fire) but are
+        still being built, and this waits for the load to finish.
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded or self._loading:
+                return
+            self._loading = True
+            try:
+                self.load()
+                self._loaded = True
+            finally:
+                self._loading = False
+    
+    def load(self):
+        """Load the datasets and build every load-time index"""
+        self.df_main = None      # Main engineering colleges dataset (detailed info)
+        self.df_nirf = None      # NIRF rankings dataset 
+        self.df_courses = None   # Course-specific dataset
+        self.suggestion_index = None  # Prefix index for typeahead suggestions
+        self.spell_corrector = None   # Symmetric-delete index for query spelling correction
+        self.college_profiles = None  # One row per college joined across all datasets
+        self.college_rows = None      # The profiles as a dataset ('colleges') for exports and facets
+        self.college_resolver = None  # Batched name -> profile key lookup
+        self.facet_indexes = {}       # Dataset name -> categorical codes for facet counts
+        self.row_keys = {}            # Dataset name -> college identity key of every row
+        self.row_course_groups = None # Course group of every course dataset row
+        self.query_planner = None     # Posting lists and statistics for compound queries
+        self.range_indexes = {}       # (dataset, column) -> sorted index for range filters
+        self.college_fragments = None # Rendered per-college lines reused across responses
+        self.dataset_generation = None  # Fingerprint of the loaded dataset files
+        self.bitmap_indexes = {}      # Dataset name -> row masks per criterion for OR/NOT queries
+        self.expression_cache = ExpressionCache()  # Compiled expressions keep masks of the old data
+        self.load_data()
+        self.build_suggestion_index()
+        self.build_spell_corrector()
+        self.build_college_profiles()
+        self.build_facet_indexes()
+        self.build_range_indexes()
+        self.build_query_planner()
+        self.build_bitmap_indexes()
+        self.build_college_fragments()
+        
+    def load_data(self):
+        """Load all three college datasets"""
+        try:
+            base_path = self.data_dir
+            
+            # Dataset 1: Main engineering colleges data (detailed info)
+            main_path = os.path.join(base_path, 'engineering colleges in India.csv')
+            if os.path.exists(main_path):
+                self.df_main = pd.read_csv(main_path)
+                # Clean up fee data
+                self.df_main['Average Fees'] = pd.to_numeric(self.df_main['Average Fees'], errors='coerce')
+                print(f"[SUCCESS] Main dataset: Loaded {len(self.df_main)} colleges with detailed info", file=sys.stderr)
+            else:
+                print("[ERROR] Main dataset not found", file=sys.stderr)
+                
+            # Dataset 2: NIRF Rankings
+            nirf_path = os.path.join(base_path, 'NIRF Ranking for Engineering Colleges 2024.csv')
+            if os.path.exists(nirf_path):
+                self.df_nirf = pd.read_csv(nirf_path)
+                print(f"[SUCCESS] NIRF dataset: Loaded {len(self.df_nirf)} ranked colleges", file=sys.stderr)
+            else:
+                print("[ERROR] NIRF dataset not found", file=sys.stderr)
+                
+            # Dataset 3: Course-specific data
+            course_path = os.path.join(base_path, 'Engineering.csv')
+            if os.path.exists(course_path):
+                # Try different encodings for the problematic CSV file
+                try:
+                    self.df_courses = pd.read_csv(course_path, encoding='utf-8')
+                except UnicodeDecodeError:
+                    try:
+                        self.df_courses = pd.read_csv(course_path, encoding='latin-1')
+                    except:
+                        self.df_courses = pd.read_csv(course_path, encoding='cp1252')
+                print(f"[SUCCESS] Course dataset: Loaded {len(self.df_courses)} course entries", file=sys.stderr)
+            else:
+                print("[ERROR] Course dataset not found", file=sys.stderr)
+                
+        except Exception as e:
+            print(f"[ERROR] Error loading data: {str(e)}", file=sys.stderr)
+            
+    def build_suggestion_index(self):
+        """Build the typeahead index over college names, courses and places.
+        
+        Colleges are ranked by NIRF rank (then by number of courses offered),
+        courses by how many programs offer them and places by college count.
+        """
+        index = SuggestionIndex()
+        
+        if self.df_nirf is not None:
+            for _, college in self.df_nirf.iterrows():
+                # Rank 1 scores highest; every ranked college outranks unranked ones
+                score = 1000 - int(college['Rank'])
+                index.add(college['Name'], 'college', score, name_aliases(college['Name']))
+            for column in ['City', 'State']:
+                for place, count in self.df_nirf[column].map(clean_text).value_counts().items():
+                    index.add(place, 'city' if column == 'City' else 'state', int(count))
+        
+        if self.df_courses is not None:
+            courses = self.df_courses.dropna(subset=['college name'])
+            for name, count in courses['college name'].map(clean_text).value_counts().items():
+                index.add(name, 'college', int(count), name_aliases(name))
+            for course, count in courses['Course'].map(clean_text).value_counts().items():
+                index.add(course, 'course', int(count))
+            for place, count in courses['District'].map(clean_text).value_counts().items():
+                index.add(place, 'district', int(count))
+            states = courses['State'].map(lambda x: clean_place(x, self.LOCATIONS))
+            for place, count in states.value_counts().items():
+                index.add(place, 'state', int(count))
+        
+        if self.df_main is not None:
+            for _, college in self.df_main.iterrows():
+                index.add(college['College Name'], 'college', 0, name_aliases(college['College Name']))
+            for column, entry_type in [('City', 'city'), ('State', 'state')]:
+                for place, count in self.df_main[column].map(clean_text).value_counts().items():
+                    index.add(place, entry_type, int(count))
+        
+        self.suggestion_index = index.build()
+        print(f"[SUCCESS] Suggestion index: {len(index)} entries", file=sys.stderr)
+    
+    def suggest(self, prefix, limit=8):
+        """Return typeahead suggestions for a partially typed query"""
+        self.ensure_loaded()
+        if self.suggestion_index is None:
+            return []
+        return self.suggestion_index.suggest(prefix, limit)
+    
+    def add_query_vocabulary(self, corrector):
+        """Add the words known without any data: the query language, places, courses and facilities"""
+        # Query-language words are known but never offered as corrections; only
+        # places, courses, facilities and college names are correction targets
+        for word in QUERY_VOCABULARY:
+            corrector.add_word(word, 1000, target=False)
+        for location in self.LOCATIONS:
+            corrector.add_text(location, 500)
+        for variants in self.COURSE_MAPPINGS.values():
+            for variant in variants:
+                corrector.add_text(variant, 500)
+        for facility in self.FACILITIES:
+            corrector.add_text(facility, 500)
+    
+    def query_spell_corrector(self):
+        """A corrector over the query vocabulary alone, usable without loading the datasets"""
+        corrector = SymSpellCorrector()
+        self.add_query_vocabulary(corrector)
+        return corrector.build()
+    
+    def build_spell_corrector(self):
+        """Build the spelling-correction dictionary from the query language and the data"""
+        corrector = SymSpellCorrector()
+        self.add_query_vocabulary(corrector)
+        
+        if self.df_nirf is not None:
+            for column in ['Name', 'City', 'State']:
+                for value in self.df_nirf[column].dropna():
+                    corrector.add_text(value)
+        
+        if self.df_courses is not None:
+            for column in ['college name', 'State', 'District']:
+                for value in self.df_courses[column].dropna().unique():
+                    corrector.add_text(clean_place(value, self.LOCATIONS) if column == 'State' else value)
+            for value in self.df_courses['Course'].dropna().unique():
+                corrector.add_text(value)
+        
+        if self.df_main is not None:
+            for column in ['College Name', 'City', 'State']:
+                for value in self.df_main[column].dropna().unique():
+                    corrector.add_text(value)
+        
+        self.spell_corrector = corrector.build()
+        print(f"[SUCCESS] Spelling dictionary: {len(corrector.words)} words", file=sys.stderr)
+    
+    def correct_query(self, query):
+        """Correct misspelt words in a query before intent parsing.
+        
+        Returns the corrected query and the list of corrections applied.
+        """
+        self.ensure_loaded()
+        if self.spell_corrector is None:
+            return query, []
+        return self.spell_corrector.correct(query)
+    
+    def build_college_profiles(self):
+        """Precompute the per-college profile table used for comparisons"""
+        self.college_profiles = build_college_profiles(
+            self.df_main, self.df_nirf, self.df_courses,
+            self.normalize_college_name, self.LOCATIONS
+        )
+        self.college_rows = college_rows(self.college_profiles)
+        self.college_resolver = CollegeResolver(self.college_profiles, self.normalize_college_name)
+        print(f"[SUCCESS] College profiles: {len(self.college_profiles)} colleges", file=sys.stderr)
+    
+    def course_group(self, course):
+        """Map a raw course name to its COURSE_MAPPINGS group ('other' if none match)"""
+        course_lower = clean_text(course).lower()
+        if not course_lower:
+            return None
+        for course_key, course_variants in self.COURSE_MAPPINGS.items():
+            if any(variant in course_lower for variant in course_variants if len(variant) > 3):
+                return course_key
+        return 'other'
+    
+    def build_facet_indexes(self):
+        """Factorize the facet columns of each dataset once at load time"""
+        self.facet_indexes = {}
+        
+        if self.df_courses is not None:
+            df = self.df_courses
+            index = FacetIndex(len(df))
+            index.add_facet('state', df['State'].map(lambda x: clean_place(x, self.LOCATIONS)))
+            index.add_facet('region', df['Institute Region'].map(clean_text))
+            index.add_facet('institute_type', df['Institute Type'].map(clean_text))
+            index.add_facet('college_category', df['College Category'].map(clean_text))
+            index.add_facet('course_group', df['Course'].map(self.course_group))
+            index.add_facet('nba', df['NBA'].map(clean_text).replace({'-': 'Unknown', '': None}))
+            index.add_facet('naac', df['NAAC'].map(clean_text).replace({'-': 'Unknown', '': None}))
+            nirf_ranked = df['NIRF'].map(clean_text).str.contains(r'\d', na=False)
+            index.add_facet('nirf_ranked', nirf_ranked.map({True: 'Yes', False: 'No'}).where(df['college name'].notna()))
+            self.facet_indexes['courses'] = index
+        
+        if self.df_nirf is not None:
+            index = FacetIndex(len(self.df_nirf))
+            index.add_facet('state', self.df_nirf['State'].map(clean_text))
+            index.add_facet('nirf_ranked', ['Yes'] * len(self.df_nirf))
+            self.facet_indexes['nirf'] = index
+        
+        if self.df_main is not None:
+            index = FacetIndex(len(self.df_main))
+            index.add_facet('state', self.df_main['State'].map(clean_text))
+            index.add_facet('institute_type', self.df_main['College Type'].map(clean_text))
+            ranked_keys = set(self.college_profiles.index[self.college_profiles['nirf_rank'].notna()])
+            ranked = self.df_main['College Name'].map(lambda x: self.normalize_college_name(x) in ranked_keys)
+            index.add_facet('nirf_ranked', ranked.map({True: 'Yes', False: 'No'}))
+            self.facet_indexes['main'] = index
+        
+        rows = self.college_rows
+        index = FacetIndex(len(rows))
+        index.add_facet('state', rows['state'].map(clean_text))
+        index.add_facet('institute_type', rows['institute_type'].map(clean_text))
+        index.add_facet('nirf_ranked', rows['nirf_rank'].notna().map({True: 'Yes', False: 'No'}))
+        self.facet_indexes['colleges'] = index
+    
+    def locations_in(self, value):
+        """Known locations mentioned in a city/state/district value ('New Delhi' -> ['delhi'])"""
+        text = clean_place(value, self.LOCATIONS).lower()
+        return [location for location in self.LOCATIONS if location in text]
+    
+    def build_range_indexes(self):
+        """Sort the numeric filter columns once so range filters are binary searches"""
+        columns = {
+            'nirf': ['Rank'],
+            'main': ['Average Fees', 'Established Year'],
+        }
+        self.range_indexes = {}
+        for dataset, names in columns.items():
+            df = self.dataset_frame(dataset)
+            if df is None:
+                continue
+            for column in names:
+                if column in df:
+                    values = pd.to_numeric(df[column], errors='coerce')
+                    self.range_indexes[(dataset, column)] = SortedRangeIndex(values)
+    
+    def range_filter(self, dataset, column, low=None, high=None):
+        """Rows of a dataset whose column lies in [low, high] (None leaves a side open)"""
+        index = self.range_indexes[(dataset, column)]
+        return self.dataset_frame(dataset).iloc[index.positions(low, high)]
+    
+    def build_query_planner(self):
+        """Index every filterable attribute by college identity key for the planner"""
+        planner = QueryPlanner()
+        self.row_keys = {}
+        
+        if self.df_nirf is not None:
+            keys = self.df_nirf['Name'].map(self.normalize_college_name)
+            self.row_keys['nirf'] = keys.to_numpy()
+            planner.add_numeric('rank', keys, self.df_nirf['Rank'])
+            planner.add_postings('location', keys, self.df_nirf['City'].map(self.locations_in))
+            planner.add_postings('location', keys, self.df_nirf['State'].map(self.locations_in))
+        
+        if self.df_courses is not None:
+            df = self.df_courses
+            keys = df['college name'].map(self.normalize_college_name)
+            self.row_keys['courses'] = keys.to_numpy()
+            self.row_course_groups = df['Course'].map(self.course_group).to_numpy()
+            planner.add_numeric('established', keys, pd.to_numeric(df['Year of Establishment'], errors='coerce'))
+            planner.add_postings('course', keys, self.row_course_groups)
+            planner.add_postings('location', keys, df['State'].map(self.locations_in))
+            planner.add_postings('location', keys, df['District'].map(self.locations_in))
+            planner.add_postings('type', keys, df['Institute Type'].map(
+                lambda x: next(iter(self.institute_types(x)), None)
+            ))
+        
+        if self.df_main is not None:
+            df = self.df_main
+            keys = df['College Name'].map(self.normalize_college_name)
+            self.row_keys['main'] = keys.to_numpy()
+            planner.add_numeric('fee', keys, df['Average Fees'])
+            planner.add_numeric('established', keys, pd.to_numeric(df['Established Year'], errors='coerce'))
+            planner.add_postings('location', keys, df['City'].map(self.locations_in))
+            planner.add_postings('location', keys, df['State'].map(self.locations_in))
+            planner.add_postings('type', keys, df['College Type'].map(
+                lambda x: next(iter(self.institute_types(x)), None)
+            ))
+            planner.add_postings('facility', keys, df['Facilities'].map(
+                lambda x: [f for f in self.FACILITIES if f in str(x).lower()] if pd.notna(x) else []
+            ))
+        
+        self.row_keys['colleges'] = self.college_rows['key'].to_numpy()
+        self.query_planner = planner
+    
+    def institute_types(self, value):
+        """Type words for an institute type value ('Government Autonomous' -> ['government', 'autonomous'])"""
+        text = clean_text(value).lower()
+        types = []
+        if text.startswith('government') or text.startswith('public'):
+            types.append('government')
+        elif text.startswith('private'):
+            types.append('private')
+        types.extend(word for word in ('autonomous', 'deemed') if word in text)
+        return types
+    
+    def build_expression_phrases(self):
+        """Query phrase -> (attribute, value) for every criterion an expression can name"""
+        phrases = {}
+        for course_key, course_variants in self.COURSE_MAPPINGS.items():
+            for variant in course_variants:
+                phrases[variant] = ('course', course_key)
+        for location in self.LOCATIONS:
+            phrases[location] = ('location', location)
+        for attribute, table in (('type', TYPE_PHRASES), ('category', CATEGORY_PHRASES),
+                                 ('accreditation', ACCREDITATION_PHRASES)):
+            for phrase, value in table.items():
+                phrases[phrase] = (attribute, value)
+        return phrases
+    
+    def build_bitmap_indexes(self):
+        """College masks per criterion value, combined with & | ~ to answer OR/NOT queries"""
+        self.bitmap_indexes = {}
+        
+        def colleges(dataset):
+            # One group per college identity key, so criteria are combined per college
+            return pd.factorize(self.row_keys[dataset])[0]
+        
+        if self.df_courses is not None:
+            df = self.df_courses
+            index = BitmapIndex(colleges('courses'))
+            index.add('course', self.row_course_groups)
+            index.add('location', [state + district for state, district in zip(
+                df['State'].map(self.locations_in), df['District'].map(self.locations_in))])
+            index.add('type', df['Institute Type'].map(self.institute_types))
+            index.add('category', df['Women Institute'].map(
+                lambda x: ['women'] if clean_text(x).lower() == 'yes' else []))
+            nba = df['NBA'].map(clean_text).str.lower().eq('yes')
+            naac = df['NAAC'].map(clean_text).str.lower().eq('yes')
+            index.add('accreditation', [['nba'] * a + ['naac'] * b for a, b in zip(nba, naac)])
+            self.bitmap_indexes['courses'] = index
+        
+        if self.df_nirf is not None:
+            index = BitmapIndex(colleges('nirf'))
+            index.add('location', [city + state for city, state in zip(
+                self.df_nirf['City'].map(self.locations_in), self.df_nirf['State'].map(self.locations_in))])
+            self.bitmap_indexes['nirf'] = index
+        
+        if self.df_main is not None:
+            df = self.df_main
+            index = BitmapIndex(colleges('main'))
+            index.add('location', [city + state for city, state in zip(
+                df['City'].map(self.locations_in), df['State'].map(self.locations_in))])
+            index.add('type', df['College Type'].map(self.institute_types))
+            self.bitmap_indexes['main'] = index
+    
+    def compile_query(self, query):
+        """The criteria of a query as an Expression (None if it names none).
+
+        Parsing is cheap; the cached Expression for the normalized key carries
+        the row masks, so "cse or ece" and "ECE or CSE colleges" share them.
+        """
+        expression = parse_expression(tokenize(self.course_query_text(query), self.expression_phrases))
+        if expression is None:
+            return None
+        return self.expression_cache.get(expression.key, lambda: expression)
+    
+    def build_predicates(self, intent):
+        """Turn a parsed intent into planner predicates"""
+        predicates = []
+        if intent['courses']:
+            predicates.append(Predicate('course', intent['courses'], f"course: {', '.join(intent['courses'])}"))
+        if intent['locations']:
+            locations = [location.lower() for location in intent['locations']]
+            predicates.append(Predicate('location', locations, f"location: {', '.join(intent['locations'])}"))
+        if intent['college_type']:
+            predicates.append(Predicate('type', [intent['college_type']], f"type: {intent['college_type']}"))
+        if intent['rank_range']:
+            low, high = intent['rank_range']
+            predicates.append(Predicate('rank', (low, high), f"NIRF rank {low}-{high}"))
+        if intent['year_range']:
+            low, high = intent['year_range']
+            if low is None:
+                label = f"established before {high + 1}"
+            elif high is None:
+                label = f"established in {low} or later"
+            else:
+                label = f"established in {low}" if low == high else f"established {low}-{high}"
+            predicates.append(Predicate('established', (low, high), label))
+        if intent['fee_range']:
+            low, high = intent['fee_range']
+            if low is None:
+                label = f"fees under Rs.{high / 100000:g} lakhs"
+            elif high is None:
+                label = f"fees above Rs.{low / 100000:g} lakhs"
+            else:
+                label = f"fees Rs.{low / 100000:g}-{high / 100000:g} lakhs"
+            predicates.append(Predicate('fee', (low, high), label))
+        if intent['facilities']:
+            predicates.append(Predicate('facility', intent['facilities'], f"facilities: {', '.join(intent['facilities'])}"))
+        return predicates
+    
+    def is_compound(self, intent, predicates):
+        """Whether a query needs the planner rather than a single-dataset branch"""
+        return len(predicates) >= 2 or (len(predicates) == 1 and intent['ranking'] and predicates[0].attribute != 'rank')
+    
+    def search_planned(self, query, intent, predicates, deadline=None):
+        """Answer a query by planning its predicates across all datasets"""
+        if deadline is None:
+            deadline = never_expires()
+        ordered, unsupported = self.query_planner.plan(predicates)
+        keys, trace = self.query_planner.execute(ordered, deadline)
+        skipped = [step['predicate'] for step in trace if step['method'] == 'skipped']
+        ordered = [predicate for predicate in ordered if predicate.label not in skipped]
+        if skipped and not ordered:
+            return self.budget_spent_result()
+        
+        profiles = self.college_profiles
+        matched = profiles[profiles.index.isin(keys)]  # already in NIRF rank order
+        limit = intent['top_n'] or (10 if intent['ranking'] else 5)
+        
+        # Rows behind the matched colleges, for facets and exports: the first dataset
+        # holding every matched college, else one profile row per college
+        order = ['nirf', 'courses', 'main'] if intent['ranking'] else ['courses', 'nirf', 'main']
+        if intent['courses']:
+            order.remove('courses')
+            order.insert(0, 'courses')
+        answered = set(matched.index)
+        for dataset in order + ['colleges']:
+            if dataset not in self.row_keys:
+                continue
+            mask = self.matched_rows(dataset, keys, intent)
+            if dataset == 'colleges' or answered <= set(self.row_keys[dataset][mask]):
+                break
+        matches = self.dataset_frame(dataset)[mask]
+        
+        response = self.format_planned_results(matched.head(limit), len(matched), ordered, unsupported, intent,
+                                               deadline, skipped)
+        return {
+            'response': response,
+            'branch': 'planned',
+            'dataset': dataset,
+            'matches': matches,
+            'result_count': len(matched),
+            'plan': trace,
+        }
+    
+    def matched_rows(self, dataset, keys, intent):
+        """Row mask of the rows of `dataset` behind the matched college keys.
+        
+        A key can stand for several colleges or campuses ("cmr", "amrita"), so the
+        course, location and type criteria are applied to each row again.
+        """
+        mask = pd.Series(self.row_keys[dataset]).isin(keys).to_numpy()
+        index = self.bitmap_indexes.get(dataset)
+        if index is None:
+            return mask
+        criteria = [
+            ('course', intent['courses']),
+            ('location', [location.lower() for location in intent['locations']]),
+            ('type', [intent['college_type']] if intent['college_type'] else []),
+        ]
+        for attribute, values in criteria:
+            if values and index.supports({attribute}):
+                mask = mask & index.row_mask(attribute, values)
+        return mask
+    
+    def needs_bitmaps(self, expression):
+        """Whether only the bitmap indexes can answer an expression: it uses OR / NOT,
+        names a criterion the planner does not index (accreditation, women's, autonomous)
+        or asks for several courses at once ("cse and ece": colleges offering both)"""
+        if expression is None:
+            return False
+        if len(expression.positive_values('course')) > 1:
+            return True
+        for term, _ in expression.root.terms():
+            if term.attribute not in ('course', 'location', 'type'):
+                return True
+            if term.attribute == 'type' and term.value not in ('government', 'private'):
+                return True
+        return expression.is_boolean
+    
+    def search_boolean(self, query, intent, expression, deadline=None):
+        """Answer a query with OR / NOT by evaluating its expression as row masks"""
+        if deadline is None:
+            deadline = never_expires()
+        label = str(expression)
+        attributes = expression.attributes()
+        order = ['nirf', 'courses', 'main'] if intent['ranking'] else ['courses', 'main', 'nirf']
+        dataset = next((name for name in order if name in self.bitmap_indexes
+                        and self.bitmap_indexes[name].supports(attributes)), None)
+        if dataset is None:
+            return {
+                'response': f"Sorry, no single dataset can answer {label}; try fewer criteria.\n",
+                'branch': 'boolean',
+                'dataset': None,
+                'matches': None,
+                'result_count': 0,
+            }
+        
+        if deadline.expired('search'):
+            return self.budget_spent_result()
+        index = self.bitmap_indexes[dataset]
+        mask = expression.mask(dataset, index)
+        # Rank, fee and year ranges still apply, through the planner's range indexes
+        ranges = [predicate for predicate in self.build_predicates(intent)
+                  if predicate.attribute in ('rank', 'fee', 'established')]
+        ordered, unsupported = self.query_planner.plan(ranges)
+        row_keys = pd.Series(self.row_keys[dataset])
+        skipped = []
+        if ordered:
+            keys, trace = self.query_planner.execute(ordered, deadline)
+            skipped = [step['predicate'] for step in trace if step['method'] == 'skipped']
+            ordered = [predicate for predicate in ordered if predicate.label not in skipped]
+            if ordered:
+                mask = mask & row_keys.isin(keys).to_numpy()
+        keys = set(row_keys[mask]) - {''}
+        
+        # Rows behind the matches: only the programs asked for, unless that would
+        # drop a matched college ("cse or not kerala" matches colleges without CSE)
+        courses = expression.positive_values('course')
+        if courses and index.supports({'course'}):
+            asked = mask & index.row_mask('course', courses)
+            if set(row_keys[asked]) - {''} == keys:
+                mask = asked
+        
+        profiles = self.college_profiles
+        matched = profiles[profiles.index.isin(keys)]  # already in NIRF rank order
+        limit = intent['top_n'] or (10 if intent['ranking'] else 5)
+        predicates = [Predicate('expression', None, label)] + ordered
+        # Only list the courses that were asked for, not the excluded ones
+        shown = dict(intent, courses=courses)
+        response = self.format_planned_results(matched.head(limit), len(matched), predicates, unsupported, shown,
+                                               deadline, skipped)
+        return {
+            'response': response,
+            'branch': 'boolean',
+            'dataset': dataset,
+            'matches': self.dataset_frame(dataset)[mask],
+            'result_count': len(matched),
+            'expression': label,
+        }
+    
+    def format_planned_results(self, colleges, total, predicates, unsupported, intent, deadline=None, skipped=()):
+        """Format colleges found by the planner (`skipped`: labels of criteria the time budget cut)"""
+        if deadline is None:
+            deadline = never_expires()
+        response = ''
+        shown = 0
+        for idx, key in enumerate(colleges.index, 1):
+            shown = idx
+            fragment = self.cached_fragment(key, deadline)
+            name = fragment.get('name', f"**{colleges.at[key, 'name']}**")
+            response += f"{idx}. {name}{fragment.get('rank', '')}\n"
+            response += self.join_fragment(fragment, 'location', 'type')
+            if intent['courses']:
+                courses = [course for course in colleges.at[key, 'courses'] if self.course_group(course) in intent['courses']]
+                if courses:
+                    response += f"Courses: {', '.join(courses[:3])}"
+                    if len(courses) > 3:
+                        response += f" (+{len(courses)-3} more)"
+                    response += "\n"
+            else:
+                response += fragment.get('courses', '')
+            if intent['year_range']:
+                response += fragment.get('established', '')
+            response += fragment.get('fees', '')
+            response += "\n"
+        
+        criteria = ', '.join(predicate.label for predicate in predicates) or 'your query'
+        if total == 0:
+            header = f"Sorry, I couldn't find any colleges matching {criteria}.\n"
+        else:
+            header = f"Found {total} college(s) matching {criteria}"
+            if intent['ranking']:
+                header += ", ordered by NIRF rank"
+            header += f" (showing {shown}):\n\n"
+        response = header + response
+        for predicate in unsupported:
+            response += f"Note: no data available to filter by {predicate.label}; that criterion was not applied.\n"
+        for label in skipped:
+            response += f"Note: the time budget ran out before {label} was applied.\n"
+        return response
+    
+    def dataset_frame(self, dataset):
+        """Return the DataFrame for a dataset name used in search results"""
+        return {'main': self.df_main, 'nirf': self.df_nirf, 'courses': self.df_courses,
+                'colleges': self.college_rows}[dataset]
+    
+    def facet_counts(self, dataset, matches):
+        """Facet counts for the rows of `dataset` contained in the `matches` frame"""
+        self.ensure_loaded()
+        if matches is None or dataset not in self.facet_indexes:
+            return {}
+        row_ids = self.dataset_frame(dataset).index.get_indexer(matches.index)
+        return self.facet_indexes[dataset].counts(row_ids[row_ids >= 0])
+    
+    def extract_comparison_names(self, query, use_data=True):
+        """Split 'compare IIT Madras, NIT Trichy and VIT' into individual college names.
+        
+        Known college names are matched first, so "Birla Institute of Technology
+        and Science, Pilani" stays one name. With use_data=False (the shard
+        coordinator has no data) names are split on commas and 'vs', plus a
+        final 'and' / 'with'.
+        """
+        text = re.sub(r'^\s*(compare|comparison of|comparison between)\s+', '', query, flags=re.IGNORECASE)
+        if use_data:
+            self.ensure_loaded()
+            return self.college_resolver.split_names(text.strip(' ?.'))
+        parts = [part.strip(' ?.') for part in re.split(r'\s*(?:,|\bvs\.?|\bversus\b)\s*', text, flags=re.IGNORECASE)]
+        parts = [part for part in parts if part]
+        if parts:
+            parts[-1:] = [part for part in re.split(r'\s+(?:and|&|with)\s+(?!.*\s(?:and|&|with)\s)', parts[-1], flags=re.IGNORECASE) if part]
+        return parts
+    
+    def compare_colleges(self, names, output_format='json'):
+        """Compare several colleges side by side.
+        
+        All names are resolved in one batched lookup and the attributes are
+        gathered with a single indexed selection from the profile table, so
+        the cost stays flat as more colleges are added.
+        """
+        self.ensure_loaded()
+        keys = self.college_resolver.resolve(names)
+        found_keys = [key for key in dict.fromkeys(keys) if key is not None]
+        unresolved = [name for name, key in zip(names, keys) if key is None]
+        colleges = [self.college_fragments.get(key, 'json') for key in found_keys]
+        
+        if output_format == 'markdown':
+            return self.format_comparison_table(colleges, unresolved)
+        return {'colleges': colleges, 'unresolved': unresolved}
+    
+    def profile_records(self, table):
+        """Convert rows of the profile table to JSON-ready dicts"""
+        colleges = []
+        for row in table.to_dict('records'):
+            colleges.append({
+                'name': row['name'],
+                'nirf_rank': int(row['nirf_rank']) if pd.notna(row['nirf_rank']) else None,
+                'city': row['city'] if pd.notna(row['city']) else None,
+                'state': row['state'] if pd.notna(row['state']) else None,
+                'institute_type': row['institute_type'] if pd.notna(row['institute_type']) else None,
+                'established': int(row['established']) if pd.notna(row['established']) else None,
+                'nba': row['nba'] if pd.notna(row['nba']) else None,
+                'naac': row['naac'] if pd.notna(row['naac']) else None,
+                'course_count': int(row['course_count']),
+                'courses': row['courses'],
+                'average_fees': float(row['average_fees']) if pd.notna(row['average_fees']) else None,
+                'rating': float(row['rating']) if pd.notna(row['rating']) else None,
+            })
+        return colleges
+    
+    def format_comparison_table(self, colleges, unresolved):
+        """Render a comparison as a markdown table with one column per college"""
+        if not colleges:
+            return "Sorry, I couldn't find any of those colleges to compare."
+        
+        def fees(college):
+            if college['average_fees'] is None:
+                return '-'
+            return f"Rs.{college['average_fees'] / 100000:.2f} lakhs"
+        
+        rows = [
+            ('NIRF Rank', lambda c: c['nirf_rank']),
+            ('Location', lambda c: ', '.join(x for x in [c['city'], c['state']] if x)),
+            ('Type', lambda c: c['institute_type']),
+            ('Established', lambda c: c['established']),
+            ('NBA Accredited', lambda c: c['nba']),
+            ('NAAC Accredited', lambda c: c['naac']),
+            ('Average Fees', fees),
+            ('Courses', lambda c: f"{c['course_count']} ({', '.join(c['courses'][:3])})" if c['courses'] else None),
+        ]
+        
+        response = "| | " + " | ".join(f"**{c['name']}**" for c in colleges) + " |\n"
+        response += "|---" * (len(colleges) + 1) + "|\n"
+        for label, value in rows:
+            cells = [value(c) for c in colleges]
+            response += f"| {label} | " + " | ".join('-' if cell in (None, '') else str(cell) for cell in cells) + " |\n"
+        
+        if unresolved:
+            response += f"\nCould not find: {', '.join(unresolved)}\n"
+        return response
+    
+    def normalize_college_name(self, name):
+        """Normalize college names for better matching across datasets"""
+        if pd.isna(name):
+            return ""
+        name = str(name).lower()
+        # Remove common prefixes/suffixes and standardize
+        name = re.sub(r'\b(university|college|institute|technology|engineering)\b', '', name)
+        name = re.sub(r'[^\w\s]', ' ', name)  # Remove punctuation
+        name = ' '.join(name.split())  # Clean whitespace
+        return name
+    
+    def find_college_across_datasets(self, college_name):
+        """Find college information across all three datasets"""
+        normalized_name = self.normalize_college_name(college_name)
+        result = {}
+        
+        # Search in main dataset
+        if self.df_main is not None:
+            main_mask = self.df_main['College Name'].apply(
+                lambda x: normalized_name in self.normalize_college_name(x) if pd.notna(x) else False
+            )
+            if main_mask.any():
+                result['main'] = self.df_main[main_mask].iloc[0]
+        
+        # Search in NIRF dataset
+        if self.df_nirf is not None:
+            nirf_mask = self.df_nirf['Name'].apply(
+                lambda x: normalized_name in self.normalize_college_name(x) if pd.notna(x) else False
+            )
+            if nirf_mask.any():
+                result['nirf'] = self.df_nirf[nirf_mask].iloc[0]
+        
+        # Search in course dataset
+        if self.df_courses is not None:
+            course_mask = self.df_courses['college name'].apply(
+                lambda x: normalized_name in self.normalize_college_name(x) if pd.notna(x) else False
+            )
+            if course_mask.any():
+                result['courses'] = self.df_courses[course_mask]
+                
+        return result
+    
+    def extract_numbers(self, text):
+        """Extract numbers from text"""
+        numbers = re.findall(r'\d+(?:\.\d+)?', text.lower())
+        return [float(num) for num in numbers]
+    
+    def extract_location(self, text):
+        """Extract location mentions from text"""
+        text_lower = text.lower()
+        found_locations = []
+        for location in self.LOCATIONS:
+            if location in text_lower:
+                found_locations.append(location.title())
+        return found_locations
+    
+    def search_by_ranking(self, query, truncate=True):
+        """Search colleges by NIRF ranking (truncate=False keeps every row a bare "top" matches)"""
+        if self.df_nirf is None:
+            return None
+            
+        query_lower = query.lower()
+        
+        # Extract rank numbers or ranges (founding years are not ranks)
+        numbers = self.extract_numbers(self.strip_year_range(query))
+        
+        if 'top' in query_lower:
+            if numbers:
+                top_n = int(min(numbers))  # Get the smallest number as top N
+                return self.df_nirf.head(top_n)
+            else:
+                return self.df_nirf.head(10) if truncate else self.df_nirf  # Default top 10
+        elif numbers:
+            # Specific rank range
+            if len(numbers) >= 2:
+                start_rank = int(min(numbers))
+                end_rank = int(max(numbers))
+                return self.range_filter('nirf', 'Rank', start_rank, end_rank)
+            else:
+                # Single rank or top N
+                rank = int(numbers[0])
+                if rank <= len(self.df_nirf):
+                    return self.range_filter('nirf', 'Rank', rank, rank)
+        
+        return None
+    
+    def search_by_course(self, query):
+        """Search colleges by specific courses"""
+        if self.df_courses is None:
+            return None
+        
+        mentioned_courses = []
+        for course_key in self.mentioned_course_groups(query):
+            # Short variants ('it', 'cse') would match inside unrelated course names
+            mentioned_courses.extend(variant for variant in self.COURSE_MAPPINGS[course_key] if len(variant) > 3)
+        
+        if mentioned_courses:
+            course_filter = self.df_courses['Course'].str.contains('|'.join(mentioned_courses), case=False, na=False)
+            return self.df_courses[course_filter]
+        
+        return None
+    
+    def course_query_text(self, query):
+        """Lowercased query for course matching: only a capitalised 'IT' names the
+        course, so it is spelled out and the pronoun 'it' is dropped"""
+        text = re.sub(r'\bIT\b', 'information technology', query).lower()
+        return re.sub(r'\bit\b', ' ', text)
+    
+    def mentioned_course_groups(self, query):
+        """Course groups named in a query (whole words, so 'cse' does not match 'cses')"""
+        query_lower = self.course_query_text(query)
+        return [
+            course_key for course_key, course_variants in self.COURSE_MAPPINGS.items()
+            if any(re.search(r'\b' + re.escape(variant) + r'\b', query_lower) for variant in course_variants)
+        ]
+    
+    def year_range_match(self, query):
+        """Match of a founding-year filter ('founded before 1960', 'established 1950-1970'), or None"""
+        pattern = (r'\b(?:(founded|established|estd|started|set up)\s+)?(before|after|since|from|between|in)?\s*'
+                   r'\b((?:18|19|20)\d{2})\b(?:\s*(?:-|to|and)\s*((?:18|19|20)\d{2})\b)?')
+        for match in re.finditer(pattern, query.lower()):
+            if match.group(1) or match.group(2) in ('before', 'after', 'since', 'between'):
+                return match
+        return None
+    
+    def extract_year_range(self, query):
+        """Establishment year bounds as (low, high), either side None when open, or None"""
+        match = self.year_range_match(query)
+        if not match:
+            return None
+        direction, year = match.group(2), int(match.group(3))
+        if match.group(4):
+            other = int(match.group(4))
+            return min(year, other), max(year, other)
+        if direction == 'before':
+            return None, year - 1
+        if direction == 'after':
+            return year + 1, None
+        if direction in ('since', 'from'):
+            return year, None
+        return year, year
+    
+    def strip_year_range(self, query):
+        """The query without its founding-year phrase, so years are not read as fees or ranks"""
+        match = self.year_range_match(query)
+        if not match:
+            return query
+        return query[:match.start()] + ' ' + query[match.end():]
+    
+    def extract_fee_range(self, query):
+        """Fee bounds in rupees as (low, high) ('under 5 lakhs', '2-5 lakhs', 'above 80k'), or None"""
+        query_lower = self.strip_year_range(query).lower()
+        unit = r'(lakhs?|lacs?|l\b|k\b)'
+        
+        def rupees(value, unit):
+            return float(value) * (1000 if unit == 'k' else 100000)
+        
+        ranged = re.search(r'(\d+(?:\.\d+)?)\s*(?:lakhs?|lacs?|l\b|k\b)?\s*(?:-|to|and)\s*(\d+(?:\.\d+)?)\s*' + unit,
+                           query_lower)
+        if ranged:
+            low, high = rupees(ranged.group(1), ranged.group(3)), rupees(ranged.group(2), ranged.group(3))
+            return min(low, high), max(low, high)
+        amounts = list(re.finditer(r'(\d+(?:\.\d+)?)\s*' + unit, query_lower))
+        if amounts:
+            amount = rupees(amounts[-1].group(1), amounts[-1].group(2))
+            if re.search(r'\b(?:above|over|more than|at least|min(?:imum)?|from)\s*$', query_lower[:amounts[-1].start()]):
+                return amount, None
+            return None, amount
+        if any(word in query_lower for word in self.FEE_WORDS):
+            # Same rule as the main dataset filter, ignoring numbers that are ranks
+            top_n, rank_range = self.extract_rank_filter(query)
+            rank_numbers = {top_n, *(rank_range or ())}
+            numbers = [n for n in self.extract_numbers(query_lower) if n not in rank_numbers]
+            if numbers:
+                return None, max(numbers) * 100000 if max(numbers) < 100 else max(numbers)
+        return None
+    
+    def extract_rank_filter(self, query):
+        """Return (top_n, rank_range) for 'top 10' / 'ranked 20-30' style queries"""
+        query_lower = query.lower()
+        top = re.search(r'\btop\s+(\d+)', query_lower)
+        top_n = int(top.group(1)) if top else None
+        rank_range = None
+        ranked = re.search(r'\brank(?:ed|s)?\s*(?:between\s*)?(\d+)(?:\s*(?:-|to|and)\s*(\d+))?', query_lower)
+        if ranked:
+            low = int(ranked.group(1))
+            high = int(ranked.group(2)) if ranked.group(2) else low
+            rank_range = (min(low, high), max(low, high))
+        return top_n, rank_range
+    
+    def mentioned_college_type(self, query):
+        """'government' or 'private' when a query asks for one ('non-government' does not count)"""
+        query_lower = query.lower()
+        if re.search(r'(?<!non-)(?<!non )\b(?:government|govt|public)\b', query_lower):
+            return 'government'
+        if re.search(r'(?<!non-)(?<!non )\bprivate\b', query_lower):
+            return 'private'
+        return None
+    
+    def is_comparison(self, query):
+        """Whether a query asks for a side-by-side comparison"""
+        query_lower = query.lower()
+        return query_lower.startswith('compare') or ' vs ' in query_lower or ' versus ' in query_lower
+    
+    def parse_intent(self, query):
+        """Summarize what a query asks for, using the same keyword rules as the search"""
+        query_lower = query.lower()
+        top_n, rank_range = self.extract_rank_filter(query)
+        expression = self.compile_query(query)
+        
+        return {
+            'comparison': self.is_comparison(query),
+            'ranking': any(word in query_lower for word in self.RANKING_WORDS),
+            'numbers': self.extract_numbers(query),
+            'locations': self.extract_location(query),
+            'courses': self.mentioned_course_groups(query),
+            'fee': any(word in query_lower for word in self.FEE_WORDS),
+            'fee_range': self.extract_fee_range(query),
+            'year_range': self.extract_year_range(query),
+            'top_n': top_n,
+            'rank_range': rank_range,
+            'rating': any(word in query_lower for word in self.RATING_WORDS),
+            'facilities': [facility for facility in self.FACILITIES if facility in query_lower],
+            'college_type': self.mentioned_college_type(query),
+            'expression': str(expression) if self.needs_bitmaps(expression) else None,
+        }
+    
+    def search_colleges(self, query):
+        """Main search function that intelligently uses all three datasets"""
+        return self.run_search(query)['response']
+    
+    def search_colleges_with_facets(self, query):
+        """Search and also return the total match count and facet counts"""
+        result = self.run_search(query)
+        return {
+            'response': result['response'],
+            'total_matches': self.matched_row_count(result),
+            'facets': self.facet_counts(result['dataset'], result['matches']),
+        }
+    
+    def matched_row_count(self, result):
+        """Matching rows of the dataset that answered: the unit facets count in
+        (programs for course data, colleges for NIRF and main data)"""
+        if result['matches'] is None:
+            return result['result_count']
+        return len(result['matches'])
+
+    def matched_college_keys(self, dataset, matches):
+        """Identity keys of the colleges behind the `matches` rows, in row order"""
+        if matches is None or dataset not in self.row_keys:
+            return []
+        row_ids = self.dataset_frame(dataset).index.get_indexer(matches.index)
+        keys = self.row_keys[dataset][row_ids[row_ids >= 0]]
+        return [key for key in dict.fromkeys(keys) if key]
+
+    def search_shard(self, query, limit=10, deadline=None):
+        """Answer a query as one shard of a sharded deployment.
+
+        Returns the `limit` best matching colleges as profile records with a
+        `score` that is comparable across shards, plus the total number of
+        matching colleges, so a coordinator can merge top-k results.
+        """
+        result = self.run_search(query, deadline)
+        keys = self.matched_college_keys(result['dataset'], result['matches'])
+        profiles = self.college_profiles
+        matched = profiles[profiles.index.isin(keys)]
+        scores = college_scores(matched)
+        top = scores.sort_values(ascending=False, kind='stable').head(limit)
+        # Copies, since the cached records are shared
+        colleges = [dict(self.college_fragments.get(key, 'json'), score=float(score)) for key, score in top.items()]
+        return {
+            'colleges': colleges,
+            'total': len(matched),
+            'branch': result['branch'],
+            'partial': result['partial'],
+            'exceeded_stage': result['exceeded_stage'],
+        }
+
+    def export(self, query, output_format='csv', columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Select every row matching a query for a streamed bulk export.
+
+        Uses the same search as the chat answer but keeps all matching rows of
+        the dataset that answered, not just the few that are displayed.
+        Returns (Export, dataset name); raises ValueError when nothing can be
+        exported or the format or columns are invalid.
+        """
+        result = self.run_search(query, truncate=False)
+        if result['matches'] is None:
+            raise ValueError("This query has no matching rows to export")
+        frame = self.dataset_frame(result['dataset'])
+        positions = frame.index.get_indexer(result['matches'].index)
+        return Export(frame, positions[positions >= 0], columns, output_format, chunk_rows), result['dataset']
+
+    def shard_info(self):
+        """What this shard holds, used by the coordinator to route queries"""
+        self.ensure_loaded()
+        locations = sorted(value for attribute, value in self.query_planner.postings if attribute == 'location')
+        return {
+            'colleges': len(self.college_profiles),
+            'locations': locations,
+            'partition': read_shard_manifest(self.data_dir),
+        }
+
+    def run_search(self, query, deadline=None, truncate=True):
+        """Run a search and describe how it was answered.
+        
+        Returns a dict with the formatted `response`, the `branch` taken
+        (compare, boolean, planned, ranking, course, main or none), the `dataset`
+        searched, all matching rows in `matches`, their `result_count` and
+        the parsed `intent`. With truncate=False, `matches` also keeps the rows
+        past the default top 10 of bare "top", cheapest and best-rated queries.
+        When a `deadline` runs out, the answer holds what was gathered so far
+        and `partial` is True.
+        """
+        self.ensure_loaded()
+        if deadline is None:
+            deadline = never_expires()
+        if deadline.expired('search'):
+            # Nothing left of the budget (e.g. spent on spelling correction)
+            result, intent = self.budget_spent_result(), None
+        else:
+            intent = self.parse_intent(query)
+            result = self.dispatch_search(query, intent, deadline, truncate)
+        result['intent'] = intent
+        result['partial'] = deadline.exceeded
+        result['exceeded_stage'] = deadline.exceeded_stage
+        if deadline.exceeded:
+            result['response'] += "(Partial results: the time budget ran out, so some details were skipped.)\n"
+        return result
+    
+    def budget_spent_result(self):
+        """Search result for a request whose time budget ran out before the search"""
+        return {
+            'response': "Sorry, the time budget ran out before the search could run.\n",
+            'branch': 'none',
+            'dataset': None,
+            'matches': None,
+            'result_count': 0,
+        }
+    
+    def dispatch_search(self, query, intent, deadline, truncate=True):
+        """Pick the datasets that answer a query and run the search"""
+        query_lower = query.lower()
+        
+        def result(response, branch, dataset=None, matches=None):
+            return {
+                'response': response,
+                'branch': branch,
+                'dataset': dataset,
+                'matches': matches,
+                'result_count': 0 if matches is None else len(matches),
+            }
+        
+        # 0. Side-by-side comparisons ("compare IIT Madras and NIT Trichy")
+        if self.is_comparison(query):
+            names = self.extract_comparison_names(query)
+            if len(names) >= 2:
+                return result(self.compare_colleges(names, output_format='markdown'), 'compare')
+        
+        # 1. Queries with OR / NOT ("CSE or ECE colleges not in Tamil Nadu") are
+        #    compiled into an expression and evaluated over row bitmaps
+        if intent['expression']:
+            return self.search_boolean(query, intent, self.compile_query(query), deadline)
+        
+        # 2. Compound queries (e.g. course + state + fee) go through the planner,
+        #    which combines every criterion instead of answering from one dataset
+        predicates = self.build_predicates(intent)
+        if self.is_compound(intent, predicates):
+            return self.search_planned(query, intent, predicates, deadline)
+        
+        # 3. Check for ranking-based queries first
+        if any(word in query_lower for word in self.RANKING_WORDS):
+            ranking_results = self.search_by_ranking(query, truncate)
+            if ranking_results is not None and not ranking_results.empty:
+                return result(self.format_nirf_results(ranking_results, query, deadline),
+                              'ranking', 'nirf', ranking_results)
+        
+        if deadline.expired('search'):
+            return self.budget_spent_result()
+        
+        # 4. Check for course-specific queries
+        course_results = self.search_by_course(query)
+        if course_results is not None and not course_results.empty:
+            # Get unique colleges from course results
+            unique_colleges = course_results['college name'].unique()[:5]
+            return result(self.format_course_results(unique_colleges, course_results, query, deadline),
+                          'course', 'courses', course_results)
+        
+        if deadline.expired('search'):
+            return self.budget_spent_result()
+        
+        # 5. Use main dataset for detailed searches (fees, facilities, etc.)
+        if self.df_main is not None and not self.df_main.empty:
+            results = self.filter_main_dataset(query, truncate)
+            return result(self.format_main_dataset_results(results, query, deadline), 'main', 'main', results)
+        
+        # 6. Single criteria no branch above could answer (e.g. "colleges in Karnataka")
+        if predicates:
+            return self.search_planned(query, intent, predicates, deadline)
+        
+        return result("Sorry, I couldn't find relevant information. Please try rephrasing your query.", 'none')
+    
+    def search_main_dataset(self, query):
+        """Search in the main dataset with detailed college information"""
+        self.ensure_loaded()
+        return self.format_main_dataset_results(self.filter_main_dataset(query), query)
+    
+    def filter_main_dataset(self, query, truncate=True):
+        """Apply the fee, year, location, rating, facility and type filters to the main dataset.
+        
+        Cheapest and best-rated queries keep the top 10 rows; with truncate=False
+        every matching row is kept in the same order (for exports).
+        """
+        query_lower = query.lower()
+        results = self.df_main.copy()
+        
+        def cheapest(frame):
+            return frame.nsmallest(10, 'Average Fees') if truncate else frame.sort_values('Average Fees', kind='stable')
+        
+        # Fee-based queries; an amount ("under 5 lakhs") filters even without a fee word
+        fee_range = self.extract_fee_range(query)
+        if fee_range:
+            results = self.range_filter('main', 'Average Fees', *fee_range)
+            if 'cheap' in query_lower or 'low' in query_lower or 'affordable' in query_lower:
+                results = cheapest(results)
+        elif any(word in query_lower for word in self.FEE_WORDS):
+            results = cheapest(results)
+
+        # Establishment year queries ("founded before 1960")
+        year_range = self.extract_year_range(query)
+        if year_range:
+            founded = self.range_filter('main', 'Established Year', *year_range)
+            results = results[results.index.isin(founded.index)]
+
+        # Location-based queries
+        locations = self.extract_location(query)
+        if locations:
+            location_filter = results['City'].str.contains('|'.join(locations), case=False, na=False) | \
+                           results['State'].str.contains('|'.join(locations), case=False, na=False)
+            results = results[location_filter]
+        
+        # Rating-based queries
+        if any(word in query_lower for word in self.RATING_WORDS):
+            results = results.dropna(subset=['Rating'])
+            if truncate:
+                results = results.nlargest(10, 'Rating')
+            else:
+                results = results.sort_values('Rating', ascending=False, kind='stable')
+        
+        # Facility-based queries
+        mentioned_facilities = [facility for facility in self.FACILITIES if facility in query_lower]
+        if mentioned_facilities:
+            facility_filter = results['Facilities'].str.contains('|'.join(mentioned_facilities), case=False, na=False)
+            results = results[facility_filter]
+        
+        # College type queries
+        college_type = self.mentioned_college_type(query)
+        if college_type == 'government':
+            results = results[results['College Type'] == 'Public/Government']
+        elif college_type == 'private':
+            results = results[results['College Type'] == 'Private']
+        
+        return results
+    
+    def format_main_dataset_results(self, results, query, deadline=None):
+        """Format the top matches of a main dataset search"""
+        if len(results) == 0:
+            return "Sorry, I couldn't find any colleges matching your criteria in the detailed database."
+        
+        return self.format_main_results(results.head(5), query, deadline)
+    
+    def format_main_results(self, results, query, deadline=None):
+        """Format results from main dataset (the NIRF rank comes from the fragment cache)"""
+        if deadline is None:
+            deadline = never_expires()
+        if len(results) == 0:
+            return "No colleges found matching your criteria."
+        
+        response = ''
+        shown = 0
+        for idx, (_, college) in enumerate(results.iterrows(), 1):
+            shown = idx
+            response += f"{idx}. **{college['College Name']}**\n"
+            response += f"Location: {college['City']}, {college['State']}\n"
+            if pd.notna(college['Rating']):
+                response += f"Rating: {college['Rating']}/5.0\n"
+            if pd.notna(college['Average Fees']):
+                response += f"Average Fees: Rs.{college['Average Fees'] / 100000:.2f} lakhs\n"
+            response += f"Type: {college['College Type']}\n"
+            if pd.notna(college['Established Year']):
+                response += f"Established: {int(college['Established Year'])}\n"
+            response += self.college_fragment(college['College Name'], deadline=deadline).get('rank_line', '')
+            response += "\n"
+        
+        return f"Found {shown} college(s) in our detailed database:\n\n" + response
+    
+    def format_nirf_results(self, results, query, deadline=None):
+        """Format NIRF ranking results (rating, fees and type come from the fragment cache)"""
+        if deadline is None:
+            deadline = never_expires()
+        response = ''
+        shown = 0
+        for idx, (_, college) in enumerate(results.iterrows(), 1):
+            shown = idx
+            response += f"{idx}. **{college['Name']}** (Rank: {int(college['Rank'])})\n"
+            response += f"Location: {college['City']}, {college['State']}\n"
+            response += self.join_fragment(self.college_fragment(college['Name'], deadline=deadline), 'rating', 'fees', 'type')
+            response += "\n"
+        
+        return f"NIRF Ranked Engineering Colleges ({shown} results):\n\n" + response
+    
+    def format_course_results(self, unique_colleges, course_data, query, deadline=None):
+        """Format course-specific results (fees and NIRF rank come from the fragment cache)"""
+        if deadline is None:
+            deadline = never_expires()
+        response = ''
+        shown = 0
+        for idx, college_name in enumerate(unique_colleges, 1):
+            shown = idx
+            response += f"{idx}. **{college_name}**\n"
+            
+            # Get courses offered at this college
+            college_rows = course_data[course_data['college name'] == college_name]
+            college_courses = college_rows['Course'].unique()
+            if len(college_courses) > 0:
+                response += f"Courses: {', '.join(college_courses[:3])}"
+                if len(college_courses) > 3:
+                    response += f" (+{len(college_courses)-3} more)"
+                response += "\n"
+            
+            first = college_rows.iloc[0]
+            location = ', '.join(x for x in [clean_text(first['District']), clean_place(first['State'], self.LOCATIONS)] if x)
+            if location:
+                response += f"Location: {location}\n"
+            response += self.join_fragment(self.college_fragment(college_name, deadline=deadline), 'fees', 'rank_line')
+            response += "\n"
+        
+        return f"Engineering Colleges offering relevant courses ({shown} colleges):\n\n" + response
+    
+    def build_college_fragments(self):
+        """Create the per-college fragment cache and pre-render the most popular colleges"""
+        self.dataset_generation = dataset_generation(self.data_dir, DATASET_FILES.values())
+        self.college_fragments = FragmentCache(self.render_college_fragment, self.dataset_generation)
+        scores = college_scores(self.college_profiles)
+        popular = scores.sort_values(ascending=False, kind='stable').head(self.FRAGMENT_WARM_COLLEGES).index
+        self.college_fragments.warm(popular)
+        print(f"[SUCCESS] College fragments: {len(popular)} colleges pre-rendered", file=sys.stderr)
+    
+    def render_college_fragment(self, key, mode):
+        """Render the reusable lines describing one college (or its record in json mode)"""
+        if key not in self.college_profiles.index:
+            return {}
+        college = self.profile_records(self.college_profiles.loc[[key]])[0]
+        if mode == 'json':
+            return college
+        
+        location = ', '.join(x for x in [college['city'], college['state']] if x)
+        courses = college['courses']
+        fragment = {
+            'name': college['name'] if mode == 'text' else f"**{college['name']}**",
+            'rank': '' if college['nirf_rank'] is None else f" (NIRF Rank: {college['nirf_rank']})",
+            'rank_line': '' if college['nirf_rank'] is None else f"NIRF Rank: {college['nirf_rank']}\n",
+            'location': f"Location: {location}\n" if location else '',
+            'type': f"Type: {college['institute_type']}\n" if college['institute_type'] else '',
+            'established': '' if college['established'] is None else f"Established: {college['established']}\n",
+            'rating': '' if college['rating'] is None else f"Rating: {college['rating']}/5.0\n",
+            'fees': '' if college['average_fees'] is None else f"Average Fees: Rs.{college['average_fees'] / 100000:.2f} lakhs\n",
+            'courses': '',
+        }
+        if courses:
+            fragment['courses'] = f"Courses: {', '.join(courses[:3])}"
+            if len(courses) > 3:
+                fragment['courses'] += f" (+{len(courses)-3} more)"
+            fragment['courses'] += "\n"
+        return fragment
+    
+    def college_fragment(self, name, mode='markdown', deadline=None):
+        """Cached fragment for a college name as it appears in any dataset"""
+        return self.cached_fragment(self.normalize_college_name(name), deadline, mode)
+    
+    def cached_fragment(self, key, deadline=None, mode='markdown'):
+        """Fragment for a college key; once `deadline` has run out, only an
+        already rendered one ({} when the college was never rendered)"""
+        if deadline is not None and deadline.expired('format'):
+            return self.college_fragments.peek(key, mode) or {}
+        return self.college_fragments.get(key, mode)
+    
+    def join_fragment(self, fragment, *fields):
+        return ''.join(fragment.get(field, '') for field in fields)
+    
+    def fragment_stats(self):
+        """Fragment cache counters, or None before the datasets are loaded"""
+        if not self._loaded:
+            return None
+        return self.college_fragments.stats()
@@ -0,0 +1,117 @@
+# Format name -> (media type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+DEFAULT_CHUNK_ROWS = 1000
+MAX_CHUNK_ROWS = 10000
+
+
+class Export:
+    """Rows of one dataset selected for a bulk export, encoded lazily in chunks.
+
+    Only the positions of the matching rows are kept; each chunk of at most
+    `chunk_rows` rows is sliced from the dataset, encoded and released before
+    the next one, so memory stays flat however many rows are exported.
+    Invalid formats and columns raise ValueError before anything is encoded.
+    """
+
+    def __init__(self, frame, positions, columns=None, output_format='csv', chunk_rows=DEFAULT_CHUNK_ROWS):
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{output_format}' (use one of: {', '.join(EXPORT_FORMATS)})")
+        if columns:
+            unknown = [column for column in columns if column not in frame.columns]
+            if unknown:
+                raise ValueError(f"Unknown column(s): {', '.join(unknown)}. "
+                                 f"Available: {', '.join(str(column) for column in frame.columns)}")
+        if output_format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.frame = frame
+        self.positions = positions
+        self.columns = list(columns) if columns else list(frame.columns)
+        self.column_ids = [frame.columns.get_loc(column) for column in self.columns]
+        self.output_format = output_format
+        self.chunk_rows = min(max(1, int(chunk_rows)), MAX_CHUNK_ROWS)
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def media_type(self):
+        return EXPORT_FORMATS[self.output_format][0]
+
+    @property
+    def extension(self):
+        return EXPORT_FORMATS[self.output_format][1]
+
+    def chunks(self):
+        """The exported rows as DataFrames of at most `chunk_rows` rows"""
+        for start in range(0, len(self.positions), self.chunk_rows):
+            yield self.frame.iloc[self.positions[start:start + self.chunk_rows], self.column_ids]
+
+    def encode(self):
+        """Yield the export as bytes, one encoded chunk at a time"""
+        if self.output_format == 'parquet':
+            yield from self._encode_parquet()
+            return
+        header = True
+        for chunk in self.chunks():
+            if self.output_format == 'csv':
+                yield chunk.to_csv(index=False, header=header).encode('utf-8')
+            else:
+                yield chunk.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n').encode('utf-8') + b'\n'
+            header = False
+        if header and self.output_format == 'csv':
+            # No rows: still send the header line
+            yield self.frame.iloc[:0, self.column_ids].to_csv(index=False).encode('utf-8')
+
+    def _encode_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        def prepared(chunk):
+            # Text columns as strings, so every row group has the same schema
+            text = [column for column in chunk.columns if chunk[column].dtype == object]
+            return chunk.astype({column: 'string' for column in text})
+
+        schema = pa.Schema.from_pandas(prepared(self.frame.iloc[:0, self.column_ids]), preserve_index=False)
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+        for chunk in self.chunks():
+            writer.write_table(pa.Table.from_pandas(prepared(chunk), schema=schema, preserve_index=False))
+            yield sink.drain()  # one row group per chunk
+        writer.close()
+        yield sink.drain()
+
+
+class _ChunkSink:
+    """Write-only file object that hands out the bytes written since the last drain"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
@@ -0,0 +1,347 @@
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Words that combine criteria; "but" reads as "and" ("private but not deemed")
+AND_WORDS = {'and', 'but', 'with', 'plus'}
+OR_WORDS = {'or', 'either'}
+NOT_WORDS = {'not', 'non', 'no', 'except', 'excluding', 'without', 'outside', 'other than'}
+
+# Words that may sit between a negation and what it negates ("not in Tamil Nadu");
+# any other unknown word ends the negation ("without hostel" negates nothing)
+FILLER_WORDS = {
+    'a', 'an', 'the', 'in', 'at', 'from', 'of', 'for', 'located', 'based', 'any', 'all',
+    'college', 'colleges', 'institute', 'institutes', 'university', 'universities',
+    'engineering', 'course', 'courses', 'program', 'programs', 'branch', 'branches',
+    'offering', 'offer', 'offers', 'having', 'has', 'have', 'that', 'which', 'are', 'is',
+    'accredited', 'accreditation', 'state', 'states', 'city', 'cities', 'type', 'only',
+}
+
+# Phrases for the criteria that have no list of their own on the engine
+TYPE_PHRASES = {
+    'government': 'government', 'govt': 'government', 'public': 'government',
+    'private': 'private', 'autonomous': 'autonomous', 'deemed': 'deemed',
+}
+CATEGORY_PHRASES = {'women': 'women', "women's": 'women', 'womens': 'women', 'girls': 'women'}
+ACCREDITATION_PHRASES = {'nba': 'nba', 'naac': 'naac'}
+
+
+class Term:
+    """A single criterion, e.g. course = computer science"""
+
+    def __init__(self, attribute, value):
+        self.attribute = attribute
+        self.value = value
+
+    def __str__(self):
+        return self.value
+
+    def key(self):
+        return f'{self.attribute}:{self.value}'
+
+    def evaluate(self, index):
+        return index.mask(self.attribute, self.value)
+
+    def terms(self, negated=False):
+        yield self, negated
+
+
+class Not:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def __str__(self):
+        return f'not {_wrap(self.operand)}'
+
+    def key(self):
+        return f'not({self.operand.key()})'
+
+    def evaluate(self, index):
+        return ~self.operand.evaluate(index)
+
+    def terms(self, negated=False):
+        yield from self.operand.terms(not negated)
+
+
+class And:
+    joiner = 'and'
+
+    def __init__(self, operands):
+        self.operands = operands
+
+    def __str__(self):
+        return f' {self.joiner} '.join(_wrap(operand) for operand in self.operands)
+
+    def key(self):
+        # Operand order does not matter, so "cse or ece" and "ece or cse" share a key
+        return f"{self.joiner}({','.join(sorted(operand.key() for operand in self.operands))})"
+
+    def evaluate(self, index):
+        return np.logical_and.reduce([operand.evaluate(index) for operand in self.operands])
+
+    def terms(self, negated=False):
+        for operand in self.operands:
+            yield from operand.terms(negated)
+
+
+class Or(And):
+    joiner = 'or'
+
+    def evaluate(self, index):
+        return np.logical_or.reduce([operand.evaluate(index) for operand in self.operands])
+
+
+def _wrap(node):
+    return f'({node})' if isinstance(node, And) else str(node)
+
+
+class Expression:
+    """A compiled query expression.
+
+    Masks are computed once per dataset and kept, so a cached
+    expression answers repeated queries with no work beyond indexing.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.key = root.key()
+        self.masks = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return str(self.root)
+
+    @property
+    def is_boolean(self):
+        """Whether the expression needs OR or NOT (plain ANDs are handled by the planner)"""
+        return any(isinstance(node, (Or, Not)) for node in _nodes(self.root))
+
+    def attributes(self):
+        return {term.attribute for term, _ in self.root.terms()}
+
+    def positive_values(self, attribute):
+        """Values of `attribute` the expression asks for (not the excluded ones)"""
+        return list(dict.fromkeys(term.value for term, negated in self.root.terms()
+                                  if term.attribute == attribute and not negated))
+
+    def mask(self, dataset, index):
+        """Boolean row mask of `dataset` (whose BitmapIndex is `index`)"""
+        mask = self.masks.get(dataset)
+        if mask is None:
+            mask = self.root.evaluate(index)
+            with self._lock:
+                self.masks[dataset] = mask
+        return mask
+
+
+def _nodes(node):
+    yield node
+    for child in getattr(node, 'operands', [getattr(node, 'operand', None)]):
+        if child is not None:
+            yield from _nodes(child)
+
+
+def tokenize(query, phrases):
+    """Split a query into operator tokens and Terms.
+
+    Filler words are dropped and runs of other words become a single '?' gap.
+
+    `phrases` maps lowercase phrases (up to four words) to (attribute, value);
+    the longest phrase wins, so 'civil engineering' is one course.
+    """
+    text = query.lower().replace('-', ' ').replace('(', ' ( ').replace(')', ' ) ')
+    words = re.findall(r"[a-z0-9']+|[()]", text)
+    tokens = []
+    position = 0
+    while position < len(words):
+        for length in (4, 3, 2, 1):
+            phrase = ' '.join(words[position:position + length])
+            if len(words) - position < length:
+                continue
+            if phrase in phrases:
+                tokens.append(Term(*phrases[phrase]))
+                break
+            if phrase in NOT_WORDS:
+                tokens.append('not')
+                break
+            if length == 1 and phrase in OR_WORDS | AND_WORDS | {'(', ')'}:
+                tokens.append('or' if phrase in OR_WORDS else 'and' if phrase in AND_WORDS else phrase)
+                break
+        else:
+            length = 1
+            if words[position] not in FILLER_WORDS and tokens[-1:] != ['?']:
+                tokens.append('?')
+        position += length
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over tokens. Precedence, loosest first: AND (explicit or
+    implied by juxtaposition), NOT, OR, then terms and parentheses, so
+    "cse or ece not in tamil nadu or kerala" is (cse or ece) and not (tamil nadu or kerala).
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.parse_and()
+        while self.peek() is not None:
+            # Stray ')' or operators: skip them and keep reading
+            self.take()
+            more = self.parse_and()
+            node = _combine(And, node, more)
+        return node
+
+    def parse_and(self):
+        node = None
+        while self.peek() not in (None, ')'):
+            if self.peek() in ('and', 'or', '?'):
+                self.take()
+                continue
+            node = _combine(And, node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.peek() == 'not':
+            self.take()
+            if self.peek() == '?':
+                return None
+            operand = self.parse_not()
+            return None if operand is None else Not(operand)
+        return self.parse_or()
+
+    def parse_or(self):
+        node = self.parse_primary()
+        while self.peek() == 'or':
+            self.take()
+            node = _combine(Or, node, self.parse_primary())
+        return node
+
+    def parse_primary(self):
+        token = self.peek()
+        if isinstance(token, Term):
+            self.take()
+            return token
+        if token == 'not':
+            self.take()
+            operand = self.parse_primary()
+            return None if operand is None else Not(operand)
+        if token == '(':
+            self.take()
+            node = self.parse_and()
+            if self.peek() == ')':
+                self.take()
+            return node
+        return None
+
+
+def _combine(kind, left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    operands = []
+    for node in (left, right):
+        operands.extend(node.operands if type(node) is kind else [node])
+    return kind(operands)
+
+
+def parse_expression(tokens):
+    """Build an Expression from tokenize() output, or None when there are no terms"""
+    root = _Parser(tokens).parse()
+    return None if root is None else Expression(root)
+
+
+class BitmapIndex:
+    """Boolean row masks per (attribute, value) over one dataset.
+
+    `groups` holds the college number of every row. Attributes listed in
+    `college_attributes` hold for every row of a college when any of its
+    rows has the value: a course row is one program, so "cse and ece" asks
+    for colleges offering both, as in the query planner. Other attributes
+    (location, type, accreditation) are per row, so a college key shared by
+    campuses in several states only matches through the right campus.
+    """
+
+    def __init__(self, groups, college_attributes=('course',)):
+        self.groups = np.asarray(groups, dtype=np.intp)
+        self.size = int(self.groups.max()) + 1 if len(self.groups) else 0
+        self.college_attributes = set(college_attributes)
+        self.bitmaps = {}       # (attribute, value) -> mask used by expressions
+        self.row_bitmaps = {}   # (attribute, value) -> rows that have the value themselves
+        self.attributes = set()
+
+    def add(self, attribute, values):
+        """Index one value, or a list of values, per row"""
+        self.attributes.add(attribute)
+        num_rows = len(self.groups)
+        exploded = pd.Series(list(values), index=np.arange(num_rows), dtype=object).explode().dropna()
+        codes, uniques = pd.factorize(exploded)
+        rows = exploded.index.to_numpy()
+        for code, value in enumerate(uniques):
+            row_bitmap = self.row_bitmaps.setdefault((attribute, value), np.zeros(num_rows, dtype=bool))
+            row_bitmap[rows[codes == code]] = True
+            if attribute in self.college_attributes:
+                colleges = np.zeros(self.size, dtype=bool)
+                colleges[self.groups[row_bitmap]] = True
+                self.bitmaps[(attribute, value)] = colleges[self.groups]
+            else:
+                self.bitmaps[(attribute, value)] = row_bitmap
+
+    def supports(self, attributes):
+        return set(attributes) <= self.attributes
+
+    def mask(self, attribute, value):
+        bitmap = self.bitmaps.get((attribute, value))
+        return bitmap if bitmap is not None else np.zeros(len(self.groups), dtype=bool)
+
+    def row_mask(self, attribute, values):
+        """Rows that themselves have any of `values`"""
+        mask = np.zeros(len(self.groups), dtype=bool)
+        for value in values:
+            bitmap = self.row_bitmaps.get((attribute, value))
+            if bitmap is not None:
+                mask |= bitmap
+        return mask
+
+
+class ExpressionCache:
+    """Least-recently-used cache of compiled expressions by normalized intent"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, compile_expression):
+        """The cached expression for `key`, calling compile_expression() on a miss"""
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+        expression = compile_expression()
+        with self._lock:
+            self.misses += 1
+            self.entries[key] = expression
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return expression
+
+    def stats(self):
+        return {'expressions': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,64 @@
+import hashlib
+import os
+import threading
+
+RENDER_MODES = ('text', 'markdown', 'json')
+
+
+def dataset_generation(data_dir, file_names):
+    """Short fingerprint of the dataset files (name, size, mtime); changes when any file does"""
+    digest = hashlib.sha1()
+    for name in sorted(file_names):
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f'{name}:{stat.st_size}:{stat.st_mtime_ns};'.encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+class FragmentCache:
+    """Rendered per-college fragments keyed by (college key, render mode, dataset generation).
+
+    `render(key, mode)` builds a fragment on a miss; for the text and
+    markdown modes a fragment is a dict of ready-to-concatenate lines, for
+    json it is the college record. Fragments are shared between responses,
+    so callers must not modify them.
+    """
+
+    def __init__(self, render, generation):
+        self.render = render
+        self.generation = generation
+        self.fragments = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, mode='markdown'):
+        cache_key = (key, mode, self.generation)
+        fragment = self.fragments.get(cache_key)
+        if fragment is not None:
+            self.hits += 1
+            return fragment
+        fragment = self.render(key, mode)
+        with self._lock:
+            self.misses += 1
+            self.fragments[cache_key] = fragment
+        return fragment
+
+    def peek(self, key, mode='markdown'):
+        """The fragment if it is already rendered, else None (never renders)"""
+        return self.fragments.get((key, mode, self.generation))
+
+    def warm(self, keys, modes=('markdown', 'json')):
+        """Render fragments ahead of time (e.g. for the most popular colleges)"""
+        for key in keys:
+            for mode in modes:
+                self.fragments[(key, mode, self.generation)] = self.render(key, mode)
+
+    def stats(self):
+        return {
+            'generation': self.generation,
+            'fragments': len(self.fragments),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
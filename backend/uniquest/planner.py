@@ -0,0 +1,144 @@
+import numpy as np
+
+from .ranges import SortedRangeIndex
+
+
+class Predicate:
+    """One filter from a query, e.g. course in {computer science} or rank in [20, 30]"""
+
+    def __init__(self, attribute, values, label):
+        self.attribute = attribute
+        self.values = values
+        self.label = label
+        self.estimate = None
+
+    def __repr__(self):
+        return f"Predicate({self.attribute}={self.values!r}, estimate={self.estimate})"
+
+
+class QueryPlanner:
+    """Plans compound queries over all three datasets by college identity key.
+
+    Every filterable attribute is indexed at load time as a posting list of
+    college keys per value (a college inherits the values of all its rows in
+    every dataset); numeric attributes use a sorted range index per college.
+    Posting list sizes and range counts are the statistics used to estimate
+    each predicate's selectivity: the most selective predicate is
+    materialized first and the remaining ones are either intersected with it
+    or, when the candidate set is already smaller than their posting lists,
+    checked per candidate key.
+    """
+
+    def __init__(self):
+        self.postings = {}        # (attribute, value) -> set of college keys
+        self.key_attributes = {}  # college key -> {attribute: set of values}
+        self.all_keys = set()
+        self.numeric = {}         # attribute -> (SortedRangeIndex, college key per index row)
+        self.numeric_by_key = {}  # attribute -> {college key: value}
+
+    def add_postings(self, attribute, keys, values):
+        """Index (key, value) pairs; `values` items may be a single value or a list"""
+        for key, value in zip(keys, values):
+            if not key:
+                continue
+            self.all_keys.add(key)
+            for item in (value if isinstance(value, (list, tuple, set)) else [value]):
+                if item is None or item != item:  # None or NaN
+                    continue
+                self.postings.setdefault((attribute, item), set()).add(key)
+                self.key_attributes.setdefault(key, {}).setdefault(attribute, set()).add(item)
+
+    def add_numeric(self, attribute, keys, values, keep='min'):
+        """Index a numeric attribute for range counts and lookups (repeat calls merge)"""
+        by_key = self.numeric_by_key.get(attribute, {})
+        for key, value in zip(keys, values):
+            if not key or value is None or value != value:
+                continue
+            self.all_keys.add(key)
+            if key not in by_key:
+                by_key[key] = value
+            else:
+                by_key[key] = min(by_key[key], value) if keep == 'min' else max(by_key[key], value)
+        index_keys = np.array(list(by_key), dtype=object)
+        self.numeric[attribute] = (SortedRangeIndex([by_key[key] for key in index_keys]), index_keys)
+        self.numeric_by_key[attribute] = by_key
+
+    def supports(self, predicate):
+        if predicate.attribute in self.numeric:
+            return len(self.numeric[predicate.attribute][0]) > 0
+        return any((predicate.attribute, value) in self.postings for value in predicate.values)
+
+    def estimate(self, predicate):
+        """Estimated number of matching colleges, from the index statistics only"""
+        if predicate.attribute in self.numeric:
+            return self.numeric[predicate.attribute][0].count(*predicate.values)
+        return sum(len(self.postings.get((predicate.attribute, value), ())) for value in predicate.values)
+
+    def materialize(self, predicate):
+        """All college keys matching a predicate"""
+        if predicate.attribute in self.numeric:
+            index, index_keys = self.numeric[predicate.attribute]
+            return set(index_keys[index.rows(*predicate.values)])
+        keys = set()
+        for value in predicate.values:
+            keys |= self.postings.get((predicate.attribute, value), set())
+        return keys
+
+    def matches(self, key, predicate):
+        """Check a single college key against a predicate"""
+        if predicate.attribute in self.numeric:
+            value = self.numeric_by_key[predicate.attribute].get(key)
+            if value is None:
+                return False
+            low, high = predicate.values
+            return (low is None or value >= low) and (high is None or value <= high)
+        values = self.key_attributes.get(key, {}).get(predicate.attribute, ())
+        return any(value in values for value in predicate.values)
+
+    def plan(self, predicates):
+        """Order the supported predicates by estimated selectivity (most selective first).
+
+        Returns (ordered predicates, unsupported predicates).
+        """
+        supported, unsupported = [], []
+        for predicate in predicates:
+            if self.supports(predicate):
+                predicate.estimate = self.estimate(predicate)
+                supported.append(predicate)
+            else:
+                unsupported.append(predicate)
+        supported.sort(key=lambda predicate: predicate.estimate)
+        return supported, unsupported
+
+    def execute(self, predicates, deadline=None):
+        """Run an ordered plan, returning (matching keys, per-step trace).
+
+        When `deadline` runs out the remaining predicates are not applied and
+        appear in the trace with method 'skipped'.
+        """
+        trace = []
+        if not predicates:
+            return set(), trace
+
+        candidates = None
+        for predicate in predicates:
+            if candidates is not None and not candidates:
+                break
+            if deadline is not None and deadline.expired('search'):
+                trace.append({'predicate': predicate.label, 'method': 'skipped',
+                              'estimate': predicate.estimate, 'matched': None})
+                continue
+            if candidates is None:
+                candidates = self.materialize(predicate)
+                trace.append({'predicate': predicate.label, 'method': 'index',
+                              'estimate': predicate.estimate, 'matched': len(candidates)})
+                continue
+            if len(candidates) <= predicate.estimate:
+                candidates = {key for key in candidates if self.matches(key, predicate)}
+                method = 'probe'
+            else:
+                candidates &= self.materialize(predicate)
+                method = 'intersect'
+            trace.append({'predicate': predicate.label, 'method': method,
+                          'estimate': predicate.estimate, 'matched': len(candidates)})
+        return candidates or set(), trace
@@ -0,0 +1,237 @@
+import re
+
+import pandas as pd
+
+from .suggest import COMMON_ABBREVIATIONS, clean_place, clean_text, name_aliases
+
+# Older or colloquial city names users type for colleges
+CITY_ALIASES = {
+    'trichy': 'tiruchirappalli',
+    'tiruchi': 'tiruchirappalli',
+    'bombay': 'mumbai',
+    'calcutta': 'kolkata',
+    'surathkal': 'karnataka surathkal',
+    'bhu': 'banaras hindu university',
+    'ism': 'indian school of mines',
+}
+
+# Words that separate the colleges in a comparison ("IIT Madras vs NIT Trichy")
+NAME_SEPARATORS = {',', '&', 'and', 'with', 'vs', 'versus'}
+MAX_NAME_WORDS = 15
+
+PROFILE_COLUMNS = [
+    'name', 'nirf_rank', 'city', 'district', 'state', 'institute_type',
+    'established', 'nba', 'naac', 'course_count', 'courses', 'average_fees', 'rating',
+]
+
+
+def _yes_no(values):
+    """Collapse per-program Yes/No/- flags into a single college-level flag"""
+    values = set(values.dropna().map(clean_text))
+    if 'Yes' in values:
+        return 'Yes'
+    if 'No' in values:
+        return 'No'
+    return None
+
+
+def build_college_profiles(df_main, df_nirf, df_courses, normalize, known_places=()):
+    """Join the three datasets into one row per college, keyed by normalized name.
+
+    The key is the same normalized name used by find_college_across_datasets,
+    so every dataset contributes to a college's profile through one join.
+    """
+    frames = []
+
+    if df_nirf is not None:
+        nirf = pd.DataFrame({
+            'key': df_nirf['Name'].map(normalize),
+            'nirf_name': df_nirf['Name'].map(clean_text),
+            'nirf_rank': df_nirf['Rank'],
+            'nirf_city': df_nirf['City'].map(clean_text),
+            'nirf_state': df_nirf['State'].map(clean_text),
+        })
+        frames.append(nirf[nirf['key'] != ''].groupby('key').first())
+
+    if df_courses is not None:
+        courses = df_courses.dropna(subset=['college name'])
+        courses = pd.DataFrame({
+            'key': courses['college name'].map(normalize),
+            'course_name': courses['college name'].map(clean_text),
+            'course_district': courses['District'].map(clean_text),
+            'course_state': courses['State'].map(lambda x: clean_place(x, known_places)),
+            'institute_type': courses['Institute Type'].map(clean_text),
+            'established': pd.to_numeric(courses['Year of Establishment'], errors='coerce'),
+            'nba': courses['NBA'],
+            'naac': courses['NAAC'],
+            'course': courses['Course'].map(clean_text),
+        })
+        grouped = courses[courses['key'] != ''].groupby('key')
+        frames.append(pd.DataFrame({
+            'course_name': grouped['course_name'].first(),
+            'course_district': grouped['course_district'].first(),
+            'course_state': grouped['course_state'].first(),
+            'institute_type': grouped['institute_type'].first(),
+            'established': grouped['established'].min(),
+            'nba': grouped['nba'].agg(_yes_no),
+            'naac': grouped['naac'].agg(_yes_no),
+            'courses': grouped['course'].agg(lambda values: list(dict.fromkeys(values))),
+        }))
+
+    if df_main is not None:
+        main = pd.DataFrame({
+            'key': df_main['College Name'].map(normalize),
+            'main_name': df_main['College Name'].map(clean_text),
+            'main_city': df_main['City'].map(clean_text),
+            'main_state': df_main['State'].map(clean_text),
+            'main_type': df_main['College Type'],
+            'main_established': df_main['Established Year'],
+            'average_fees': df_main['Average Fees'],
+            'rating': df_main['Rating'],
+        })
+        frames.append(main[main['key'] != ''].groupby('key').first())
+
+    if not frames:
+        return pd.DataFrame(columns=PROFILE_COLUMNS)
+
+    joined = pd.concat(frames, axis=1, join='outer')
+
+    def pick(*columns):
+        """First non-null value across the given columns (earlier columns win)"""
+        result = pd.Series(None, index=joined.index, dtype=object)
+        for column in reversed(columns):
+            if column in joined:
+                result = joined[column].where(joined[column].notna(), result)
+        return result
+
+    def earliest(*columns):
+        """Smallest value across the given numeric columns (the planner filters years the same way)"""
+        present = [pd.to_numeric(joined[column], errors='coerce') for column in columns if column in joined]
+        if not present:
+            return pd.Series(None, index=joined.index, dtype=float)
+        return pd.concat(present, axis=1).min(axis=1)
+
+    profiles = pd.DataFrame({
+        'name': pick('nirf_name', 'main_name', 'course_name'),
+        'nirf_rank': pick('nirf_rank'),
+        'city': pick('nirf_city', 'main_city', 'course_district'),
+        'district': pick('course_district'),
+        'state': pick('nirf_state', 'main_state', 'course_state'),
+        'institute_type': pick('institute_type', 'main_type'),
+        'established': earliest('established', 'main_established'),
+        'nba': pick('nba'),
+        'naac': pick('naac'),
+        'courses': pick('courses'),
+        'average_fees': pick('average_fees'),
+        'rating': pick('rating'),
+    }, index=joined.index)
+    profiles['courses'] = profiles['courses'].map(lambda x: x if isinstance(x, list) else [])
+    profiles['course_count'] = profiles['courses'].map(len)
+    profiles['nirf_rank'] = pd.to_numeric(profiles['nirf_rank'], errors='coerce')
+    profiles['established'] = pd.to_numeric(profiles['established'], errors='coerce')
+    profiles['average_fees'] = pd.to_numeric(profiles['average_fees'], errors='coerce')
+    profiles['rating'] = pd.to_numeric(profiles['rating'], errors='coerce')
+    return profiles[PROFILE_COLUMNS].sort_values('nirf_rank', na_position='last')
+
+
+def college_rows(profiles):
+    """The profile table as plain rows for exports and facets: the key as a column, courses joined"""
+    rows = profiles.rename_axis('key').reset_index()
+    rows['courses'] = rows['courses'].map('; '.join)
+    return rows
+
+
+def expand_college_query(name):
+    """Expand abbreviations ('IIT', 'NIT') and colloquial city names in a college query"""
+    words = re.findall(r'[a-z0-9]+', name.lower())
+    long_forms = {short: long for long, short in COMMON_ABBREVIATIONS.items()}
+    expanded = []
+    for position, word in enumerate(words):
+        if position == 0 and word in long_forms and len(words) > 1:
+            expanded.append(long_forms[word])
+        else:
+            expanded.append(CITY_ALIASES.get(word, word))
+    return ' '.join(expanded)
+
+
+class CollegeResolver:
+    """Resolve user-typed college names to profile keys in one batched pass"""
+
+    def __init__(self, profiles, normalize):
+        self.normalize = normalize
+        self.keys = list(profiles.index)
+        self.aliases = {}
+        # Profiles are sorted by NIRF rank, so a shared acronym resolves to
+        # the best-ranked college ("vit" -> Vellore Institute of Technology)
+        for key, name in zip(profiles.index, profiles['name']):
+            for alias in [name.lower(), key] + name_aliases(name):
+                self.aliases.setdefault(' '.join(re.findall(r'[a-z0-9]+', alias)), key)
+
+    def resolve(self, names):
+        """Return a list of profile keys (None where a name could not be resolved)"""
+        resolved = [None] * len(names)
+        pending = {}
+        for position, name in enumerate(names):
+            typed = ' '.join(re.findall(r'[a-z0-9]+', str(name).lower()))
+            expanded = expand_college_query(name)
+            key = self.aliases.get(typed) or self.aliases.get(expanded)
+            if key is None:
+                normalized = self.normalize(expanded)
+                key = self.aliases.get(normalized)
+                if key is None and normalized:
+                    pending[position] = normalized
+            resolved[position] = key
+
+        # One scan over all college keys for every name still unresolved; the
+        # name must match whole words of the key, so "iit" is not "iiitdm"
+        if pending:
+            pending = {position: f' {normalized} ' for position, normalized in pending.items()}
+            for key in self.keys:
+                padded = f' {key} '
+                for position, normalized in list(pending.items()):
+                    if normalized in padded:
+                        resolved[position] = key
+                        del pending[position]
+                if not pending:
+                    break
+        return resolved
+
+    def known_name(self, words):
+        """Profile key for a span of query words that names a college exactly, else None"""
+        text = ' '.join(word for word in words if word not in (',', '&'))
+        if not text:
+            return None
+        expanded = expand_college_query(text)
+        normalized = self.normalize(expanded)
+        return self.aliases.get(text) or self.aliases.get(expanded) or (normalized and self.aliases.get(normalized))
+
+    def split_names(self, text):
+        """Split a list of college names ('BITS Pilani, IIT Delhi and VIT').
+
+        Known names are matched greedily (longest first) before splitting, so
+        commas and 'and' / 'with' / '&' inside a name do not break it up.
+        """
+        words = re.findall(r'[a-z0-9]+|[,&]', str(text).lower())
+        names, pending = [], []
+        position = 0
+        while position < len(words):
+            if not pending and words[position] not in NAME_SEPARATORS:
+                for end in range(min(len(words), position + MAX_NAME_WORDS), position, -1):
+                    if words[end - 1] not in NAME_SEPARATORS and self.known_name(words[position:end]):
+                        names.append(' '.join(word for word in words[position:end] if word not in (',', '&')))
+                        position = end
+                        break
+                else:
+                    pending.append(words[position])
+                    position += 1
+                continue
+            if words[position] in NAME_SEPARATORS:
+                if pending:
+                    names.append(' '.join(pending))
+                pending = []
+            else:
+                pending.append(words[position])
+            position += 1
+        if pending:
+            names.append(' '.join(pending))
+        return names
@@ -0,0 +1,88 @@
+import json
+import logging
+import logging.handlers
+import os
+import random
+import time
+
+
+class QueryLogger:
+    """Opt-in structured log of chat queries, written as one JSON object per line.
+
+    Records are sampled (`sample_rate` of 0.1 keeps roughly one query in ten)
+    and written to a size-rotated file, so logging can stay enabled in
+    production. Enable it with UNIQUEST_QUERY_LOG=<path>.
+    """
+
+    def __init__(self, path, sample_rate=1.0, max_bytes=10 * 1024 * 1024, backup_count=5):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.logger = logging.getLogger(f'uniquest.querylog.{os.path.abspath(path)}')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Build a logger from UNIQUEST_QUERY_LOG* variables, or None when logging is off"""
+        environ = os.environ if environ is None else environ
+        path = environ.get('UNIQUEST_QUERY_LOG')
+        if not path:
+            return None
+        return cls(
+            path,
+            sample_rate=float(environ.get('UNIQUEST_QUERY_LOG_SAMPLE_RATE', 1.0)),
+            max_bytes=int(environ.get('UNIQUEST_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024)),
+            backup_count=int(environ.get('UNIQUEST_QUERY_LOG_BACKUPS', 5)),
+        )
+
+    def should_sample(self):
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def log(self, message, intent, branch, result_count, latency_ms, corrected=None, status='ok', partial=False):
+        """Write one query record (subject to sampling)"""
+        if not self.should_sample():
+            return
+        record = {
+            'ts': time.time(),
+            'message': message,
+            'intent': intent,
+            'branch': branch,
+            'result_count': result_count,
+            'latency_ms': round(latency_ms, 3),
+            'status': status,
+        }
+        if partial:
+            record['partial'] = True
+        if corrected is not None and corrected != message:
+            record['corrected'] = corrected
+        self.logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def read_query_log(path):
+    """Read the records of a query log, including its rotated backups, oldest first"""
+    paths = []
+    backup = 1
+    while os.path.exists(f'{path}.{backup}'):
+        paths.append(f'{path}.{backup}')
+        backup += 1
+    paths.reverse()
+    if os.path.exists(path):
+        paths.append(path)
+
+    records = []
+    for log_path in paths:
+        with open(log_path, encoding='utf-8') as log_file:
+            for line in log_file:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    records.sort(key=lambda record: record.get('ts', 0))
+    return records
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+class SortedRangeIndex:
+    """Sorted-permutation index over one numeric column.
+
+    The row ids are stored ordered by value, so any range predicate
+    ("between X and Y", "under N", "ranked 20-30") is two binary searches
+    that select a contiguous slice of row ids. Missing values are left out.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        present = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[present], kind='stable')
+        self.row_ids = present[order]
+        self.sorted_values = values[self.row_ids]
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def bounds(self, low=None, high=None, include_low=True, include_high=True):
+        """Positions [start, stop) of the sorted slice matching the range"""
+        start = 0 if low is None else int(np.searchsorted(
+            self.sorted_values, low, side='left' if include_low else 'right'))
+        stop = len(self.sorted_values) if high is None else int(np.searchsorted(
+            self.sorted_values, high, side='right' if include_high else 'left'))
+        return start, max(start, stop)
+
+    def count(self, low=None, high=None, include_low=True, include_high=True):
+        start, stop = self.bounds(low, high, include_low, include_high)
+        return stop - start
+
+    def rows(self, low=None, high=None, include_low=True, include_high=True):
+        """Row ids in the range, ordered by value"""
+        start, stop = self.bounds(low, high, include_low, include_high)
+        return self.row_ids[start:stop]
+
+    def positions(self, low=None, high=None, include_low=True, include_high=True):
+        """Row ids in the range, in row order (ready for .iloc)"""
+        return np.sort(self.rows(low, high, include_low, include_high))
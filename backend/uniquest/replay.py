@@ -0,0 +1,147 @@
+import json
+import math
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InProcessTarget:
+    """Send replayed queries straight to a MultiDatasetCollegeChatbot"""
+
+    def __init__(self, chatbot):
+        self.chatbot = chatbot
+        chatbot.ensure_loaded()
+
+    def __call__(self, message):
+        corrected, _ = self.chatbot.correct_query(message)
+        return self.chatbot.run_search(corrected)['branch']
+
+
+class HttpTarget:
+    """Send replayed queries to the /chat endpoint of a running server"""
+
+    def __init__(self, base_url, timeout=30):
+        self.url = base_url.rstrip('/') + '/chat'
+        self.timeout = timeout
+
+    def __call__(self, message):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({'message': message}).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+        return None
+
+
+def _run_one(target, record):
+    started = time.perf_counter()
+    try:
+        branch = target(record['message'])
+        error = None
+    except Exception as e:
+        branch = None
+        error = str(e)
+    return {
+        'query_class': record.get('branch') or branch or 'unknown',
+        'latency_ms': (time.perf_counter() - started) * 1000,
+        'error': error,
+    }
+
+
+def replay(records, target, speed=None, concurrency=None, max_workers=64):
+    """Replay captured records against a target, in log order.
+
+    With `speed`, queries are sent open-loop at their recorded inter-arrival
+    times divided by `speed` (2.0 replays twice as fast). Otherwise a fixed
+    number of `concurrency` workers (default 1) send them back to back.
+    """
+    records = [record for record in records if record.get('message')]
+    if not records:
+        return []
+
+    if speed:
+        first_ts = records[0].get('ts', 0)
+        results = [None] * len(records)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            started = time.perf_counter()
+            futures = []
+            for position, record in enumerate(records):
+                due = (record.get('ts', first_ts) - first_ts) / speed
+                delay = due - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append((position, pool.submit(_run_one, target, record)))
+            for position, future in futures:
+                results[position] = future.result()
+        return results
+
+    concurrency = max(1, concurrency or 1)
+    results = [None] * len(records)
+    next_position = [0]
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                position = next_position[0]
+                next_position[0] += 1
+            if position >= len(records):
+                return
+            results[position] = _run_one(target, records[position])
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(results, wall_seconds=None):
+    """Latency distribution per query class (plus an 'all' row)"""
+    groups = {'all': results}
+    for result in results:
+        groups.setdefault(result['query_class'], []).append(result)
+
+    summary = {}
+    for query_class, group in groups.items():
+        latencies = sorted(result['latency_ms'] for result in group if result['error'] is None)
+        summary[query_class] = {
+            'count': len(group),
+            'errors': sum(1 for result in group if result['error'] is not None),
+            'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50_ms': percentile(latencies, 0.50),
+            'p90_ms': percentile(latencies, 0.90),
+            'p99_ms': percentile(latencies, 0.99),
+            'max_ms': latencies[-1] if latencies else 0.0,
+        }
+    if wall_seconds:
+        summary['all']['wall_seconds'] = wall_seconds
+        summary['all']['queries_per_second'] = len(results) / wall_seconds
+    return summary
+
+
+def format_report(summary):
+    """Render a summary as a fixed-width table"""
+    lines = [f"{'class':<10} {'count':>6} {'errors':>6} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"]
+    for query_class in sorted(summary, key=lambda name: (name == 'all', name)):
+        row = summary[query_class]
+        lines.append(
+            f"{query_class:<10} {row['count']:>6} {row['errors']:>6} {row['mean_ms']:>8.2f} "
+            f"{row['p50_ms']:>8.2f} {row['p90_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['max_ms']:>8.2f}"
+        )
+    if 'queries_per_second' in summary.get('all', {}):
+        lines.append(f"wall time {summary['all']['wall_seconds']:.2f} s, "
+                     f"{summary['all']['queries_per_second']:.1f} queries/s (latencies in ms)")
+    return '\n'.join(lines)
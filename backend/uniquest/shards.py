@@ -0,0 +1,334 @@
+import json
+import os
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .deadline import never_expires
+from .suggest import clean_text
+
+MANIFEST_NAME = 'shard.json'
+
+# Dataset name -> file name in a data directory
+DATASET_FILES = {
+    'main': 'engineering colleges in India.csv',
+    'nirf': 'NIRF Ranking for Engineering Colleges 2024.csv',
+    'courses': 'Engineering.csv',
+}
+
+# Regions of states that may be missing from the course dataset's Institute Region column
+STATE_REGIONS = {
+    'arunachalpradesh': 'EAST', 'assam': 'EAST', 'jharkhand': 'EAST', 'manipur': 'EAST',
+    'meghalaya': 'EAST', 'mizoram': 'EAST', 'nagaland': 'EAST', 'sikkim': 'EAST', 'tripura': 'EAST',
+    'himachalpradesh': 'NORTH', 'jammuandkashmir': 'NORTH', 'ladakh': 'NORTH',
+    'pondicherry': 'SOUTH', 'puducherry': 'SOUTH',
+}
+
+
+def college_scores(profiles):
+    """Merge score of each college in a profile table, comparable across shards.
+
+    Higher is better: NIRF-ranked colleges come first in rank order, then
+    unranked ones by the number of programs they offer.
+    """
+    ranked = 1000.0 - profiles['nirf_rank']
+    unranked = profiles['course_count'].clip(upper=999) / 1000.0
+    return ranked.where(profiles['nirf_rank'].notna(), unranked).astype(float)
+
+
+def read_shard_manifest(data_dir):
+    """The manifest written by split_datasets into a shard data directory, or None"""
+    path = os.path.join(data_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def state_key(value):
+    """Comparable form of a state value ('Andhra\\n Prades h' -> 'andhrapradesh')"""
+    return clean_text(value).replace(' ', '').lower()
+
+
+def split_datasets(chatbot, out_dir, shard_count, by='region'):
+    """Write the datasets loaded by `chatbot` as `shard_count` shard data directories.
+
+    Rows are partitioned by state, or by the institute region of their state
+    (`by='region'`). A college's rows share a state, so every college lands on
+    exactly one shard. Partitions are assigned largest first to the least
+    loaded shard. Returns the manifest of each shard.
+    """
+    frames = {name: chatbot.dataset_frame(name) for name in DATASET_FILES}
+    frames = {name: df for name, df in frames.items() if df is not None}
+    states = {name: df['State'].map(state_key) for name, df in frames.items()}
+
+    # Region of each state, from the course dataset's Institute Region column
+    regions = dict(STATE_REGIONS)
+    if 'courses' in frames:
+        region_column = frames['courses']['Institute Region'].map(clean_text).str.upper()
+        pairs = pd.DataFrame({'state': states['courses'], 'region': region_column})
+        pairs = pairs[(pairs['state'] != '') & (pairs['region'] != '')]
+        regions.update(pairs.groupby('state')['region'].agg(lambda values: values.mode().iloc[0]).to_dict())
+
+    partitions = {}
+    for name, keys in states.items():
+        if by == 'state':
+            partitions[name] = keys.where(keys != '', 'unknown')
+        else:
+            partitions[name] = keys.map(lambda key: regions.get(key, 'OTHER'))
+
+    loads = pd.concat(partitions.values()).value_counts()
+    assignment, shard_loads = {}, [0] * shard_count
+    for partition, rows in loads.items():
+        shard = shard_loads.index(min(shard_loads))
+        assignment[partition] = shard
+        shard_loads[shard] += int(rows)
+
+    manifests = []
+    for shard in range(shard_count):
+        shard_dir = os.path.join(out_dir, f'shard-{shard}')
+        os.makedirs(shard_dir, exist_ok=True)
+        owned = sorted(partition for partition, owner in assignment.items() if owner == shard)
+        rows = {}
+        for name, df in frames.items():
+            part = df[partitions[name].isin(owned).to_numpy()]
+            part.to_csv(os.path.join(shard_dir, DATASET_FILES[name]), index=False)
+            rows[name] = len(part)
+        manifest = {'shard': shard, 'shard_count': shard_count, 'by': by, 'partitions': owned, 'rows': rows}
+        with open(os.path.join(shard_dir, MANIFEST_NAME), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        manifests.append(manifest)
+    return manifests
+
+
+class ShardClient:
+    """HTTP client for one shard node (a `uniquest serve` over a shard data directory)"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, path, payload=None, timeout=None):
+        data = None if payload is None else json.dumps(payload).encode('utf-8')
+        request = urllib.request.Request(self.base_url + path, data=data,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def info(self):
+        return self._request('/shard/info')
+
+    def search(self, message, limit, budget_ms=None):
+        payload = {'message': message, 'limit': limit}
+        timeout = None
+        if budget_ms is not None:
+            payload['budget_ms'] = budget_ms
+            # The shard answers partially when its budget runs out; allow time for the reply
+            timeout = min(self.timeout, budget_ms / 1000.0 + 1.0)
+        return self._request('/shard/search', payload, timeout)
+
+    def compare(self, names):
+        return self._request('/compare', {'colleges': names, 'format': 'json'})
+
+    def suggest(self, prefix, limit):
+        query = urllib.parse.urlencode({'prefix': prefix, 'limit': limit})
+        return self._request(f'/suggest?{query}')['suggestions']
+
+
+class ShardCoordinator:
+    """Answers queries by scattering them to shard nodes and gathering the best results.
+
+    Queries are only sent to the shards holding a location the query names
+    (every shard when it names none); each shard returns its top-k colleges
+    with a global score and the coordinator merges them. It offers the same
+    methods the web app calls on MultiDatasetCollegeChatbot, so
+    `create_app(chatbot=ShardCoordinator(urls))` serves the usual API.
+    """
+
+    def __init__(self, shard_urls, timeout=30, parser=None):
+        from .engine import MultiDatasetCollegeChatbot
+        self.shards = [ShardClient(url, timeout) for url in shard_urls]
+        # Only used to parse queries, so its datasets are never loaded
+        self.parser = parser or MultiDatasetCollegeChatbot()
+        # Places and courses are corrected before routing; shards also correct college names
+        self.spell_corrector = self.parser.query_spell_corrector()
+        self.pool = ThreadPoolExecutor(max_workers=max(4, 4 * len(self.shards)))
+        self._locations = {}  # shard index -> set of locations it holds
+        self._locations_lock = threading.Lock()
+
+    def ensure_loaded(self):
+        self.shard_locations()
+
+    def shard_locations(self):
+        """Locations held by each shard, fetched once per shard (retried while a shard is down)"""
+        with self._locations_lock:
+            missing = [index for index in range(len(self.shards)) if index not in self._locations]
+            if missing:
+                futures = {index: self.pool.submit(self.shards[index].info) for index in missing}
+                for index, future in futures.items():
+                    try:
+                        self._locations[index] = set(future.result()['locations'])
+                    except Exception as e:
+                        print(f"[ERROR] Shard {self.shards[index].base_url} unavailable: {str(e)}")
+            return dict(self._locations)
+
+    def route(self, intent):
+        """Indexes of the shards a query has to reach"""
+        everything = list(range(len(self.shards)))
+        locations = {location.lower() for location in intent['locations']}
+        # "not in Tamil Nadu" needs every other shard, so OR/NOT queries go everywhere
+        if not locations or intent['expression']:
+            return everything
+        known = self.shard_locations()
+        # A shard whose contents are unknown is always asked
+        return [index for index in everything if index not in known or known[index] & locations]
+
+    def correct_query(self, query):
+        return self.spell_corrector.correct(query)
+
+    def parse_intent(self, query):
+        return self.parser.parse_intent(query)
+
+    def extract_comparison_names(self, query):
+        return self.parser.extract_comparison_names(query, use_data=False)
+
+    def facet_counts(self, dataset, matches):
+        raise NotImplementedError("Facet counts are not available through the shard coordinator")
+
+    def matched_row_count(self, result):
+        return result['result_count']
+
+    def search_colleges(self, query):
+        return self.run_search(query)['response']
+
+    def export(self, query, output_format='csv', columns=None, chunk_rows=1000):
+        raise NotImplementedError("Exports are not available through the shard coordinator; "
+                                  "export from the shard nodes instead")
+
+    def run_search(self, query, deadline=None):
+        """Scatter a query to the shards it touches and merge their top results"""
+        if deadline is None:
+            deadline = never_expires()
+
+        def result(response, branch, count=0, partial=False, shards=None):
+            partial = partial or deadline.exceeded
+            if partial:
+                response += "(Partial results: the time budget ran out or a shard did not answer.)\n"
+            return {
+                'response': response,
+                'branch': branch,
+                'dataset': None,
+                'matches': None,
+                'result_count': count,
+                'partial': partial,
+                'exceeded_stage': deadline.exceeded_stage,
+                'shards': shards or [],
+                'intent': intent,
+            }
+
+        intent = self.parse_intent(query)
+        if self.parser.is_comparison(query):
+            names = self.extract_comparison_names(query)
+            if len(names) >= 2:
+                return result(self.compare_colleges(names, output_format='markdown'), 'compare')
+
+        limit = intent['top_n'] or (10 if intent['ranking'] else 5)
+        targets = self.route(intent)
+        futures = [(index, self.pool.submit(self.shards[index].search, query, limit, deadline.remaining_ms()))
+                   for index in targets]
+
+        colleges, total, partial, shards = [], 0, False, []
+        for index, future in futures:
+            try:
+                answer = future.result()
+            except Exception as e:
+                partial = True
+                shards.append({'shard': self.shards[index].base_url, 'error': str(e)})
+                continue
+            colleges.extend(answer['colleges'])
+            total += answer['total']
+            partial = partial or answer['partial']
+            shards.append({'shard': self.shards[index].base_url, 'branch': answer['branch'],
+                           'total': answer['total'], 'partial': answer['partial']})
+        deadline.expired('gather')
+        if intent['top_n']:
+            # Every shard answered its own "top N"; only N of them are the global top N
+            total = min(total, intent['top_n'])
+
+        colleges.sort(key=lambda college: college['score'], reverse=True)
+        response = self.format_results(colleges[:limit], total, len(targets), intent)
+        return result(response, 'sharded', total, partial, shards)
+
+    def format_results(self, colleges, total, searched, intent):
+        """Format the merged top colleges of all shards"""
+        if total == 0:
+            return "Sorry, I couldn't find relevant information. Please try rephrasing your query.\n"
+        response = f"Found {total} college(s) across {searched} shard(s)"
+        if intent['ranking']:
+            response += ", ordered by NIRF rank"
+        response += f" (showing {len(colleges)}):\n\n"
+
+        for idx, college in enumerate(colleges, 1):
+            response += f"{idx}. **{college['name']}**"
+            if college['nirf_rank'] is not None:
+                response += f" (NIRF Rank: {college['nirf_rank']})"
+            response += "\n"
+            location = ', '.join(x for x in [college['city'], college['state']] if x)
+            if location:
+                response += f"Location: {location}\n"
+            if college['institute_type']:
+                response += f"Type: {college['institute_type']}\n"
+            courses = college['courses']
+            if intent['courses']:
+                courses = [course for course in courses if self.parser.course_group(course) in intent['courses']]
+            if courses:
+                response += f"Courses: {', '.join(courses[:3])}"
+                if len(courses) > 3:
+                    response += f" (+{len(courses)-3} more)"
+                response += "\n"
+            if intent['year_range'] and college['established'] is not None:
+                response += f"Established: {college['established']}\n"
+            if college['average_fees'] is not None:
+                response += f"Average Fees: Rs.{college['average_fees'] / 100000:.2f} lakhs\n"
+            response += "\n"
+        return response
+
+    def compare_colleges(self, names, output_format='json'):
+        """Compare colleges held by any shard; a name is unresolved only if no shard knows it"""
+        futures = [self.pool.submit(shard.compare, names) for shard in self.shards]
+        colleges, unresolved = {}, set(names)
+        for future in futures:
+            try:
+                answer = future.result()
+            except Exception as e:
+                print(f"[ERROR] Shard compare failed: {str(e)}")
+                continue
+            for college in answer['colleges']:
+                colleges.setdefault(college['name'], college)
+            unresolved &= set(answer['unresolved'])
+        colleges = list(colleges.values())
+        unresolved = [name for name in names if name in unresolved]
+
+        if output_format == 'markdown':
+            return self.parser.format_comparison_table(colleges, unresolved)
+        return {'colleges': colleges, 'unresolved': unresolved}
+
+    def suggest(self, prefix, limit=8):
+        """Typeahead suggestions from every shard, merged by score"""
+        futures = [self.pool.submit(shard.suggest, prefix, limit) for shard in self.shards]
+        lists = []
+        for future in futures:
+            try:
+                lists.append(future.result())
+            except Exception as e:
+                print(f"[ERROR] Shard suggest failed: {str(e)}")
+        merged = {}
+        for suggestions in lists:
+            for suggestion in suggestions:
+                best = merged.get(suggestion['text'])
+                if best is None or suggestion['score'] > best['score']:
+                    merged[suggestion['text']] = suggestion
+        return sorted(merged.values(), key=lambda suggestion: -suggestion['score'])[:limit]
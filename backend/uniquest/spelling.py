@@ -0,0 +1,158 @@
+import re
+
+# Words users put around the entities we recognise; never "corrected"
+QUERY_VOCABULARY = [
+    'show', 'me', 'list', 'find', 'give', 'which', 'what', 'where', 'is', 'are', 'the',
+    'a', 'an', 'of', 'in', 'for', 'with', 'and', 'or', 'not', 'near', 'around', 'good',
+    'best', 'top', 'rank', 'ranked', 'ranking', 'rankings', 'nirf', 'highest', 'lowest',
+    'rated', 'rating', 'ratings', 'excellent', 'college', 'colleges', 'university',
+    'universities', 'institute', 'institutes', 'engineering', 'course', 'courses',
+    'program', 'programs', 'branch', 'fee', 'fees', 'cost', 'cheap', 'cheapest',
+    'expensive', 'budget', 'affordable', 'low', 'under', 'below', 'above', 'between',
+    'lakh', 'lakhs', 'government', 'public', 'private', 'autonomous', 'deemed',
+    'facilities', 'facility', 'campus', 'placement', 'placements', 'state', 'city',
+    'india', 'indian', 'south', 'north', 'east', 'west', 'central', 'offering', 'offer',
+    'have', 'has', 'having', 'less', 'more', 'than', 'compare', 'versus', 'founded',
+    'established', 'before', 'after', 'since', 'old', 'oldest', 'new', 'newest',
+]
+
+# General English words that are never corrected, even when they are one edit
+# away from a college or place name ("want" is not "sant", "year" is not "near")
+COMMON_WORDS = frozenset('''
+    about above after again against all also always among another answer anything
+    because been being below both bring but can cannot could course did does doing
+    done each either else enough even ever every everything few first from get gets
+    getting going gone great had have having help here how however into its just
+    know last least like likely little look looking many may maybe might more most
+    much must near need needs never next nothing now number off often once one only
+    other others our over own please prefer quite rather really right said same
+    should show some something still such sure take tell than thank thanks that
+    their them then there these they thing things think this those though through
+    till today together too try under until upon very want wanted wants was way
+    well were what when where whether which while who whom whose why will wish with
+    within without would year years yes yet you your
+    admission admissions apply applying eligibility exam exams entrance cutoff
+    cutoffs seat seats intake hostel hostels labs lab study studying student
+    students btech mtech bachelor master degree degrees diploma phd
+'''.split())
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment (Damerau-Levenshtein) distance, capped at max_distance + 1"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_minimum = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+            row_minimum = min(row_minimum, current[j])
+        if row_minimum > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[len(b)]
+
+
+class SymSpellCorrector:
+    """Spelling correction with a precomputed symmetric-delete dictionary.
+
+    Every vocabulary word is expanded at build time into all strings reachable
+    by deleting up to `max_edit_distance` characters. A misspelt token is
+    expanded the same way at lookup time, so candidate corrections are found
+    with a handful of dictionary probes instead of a scan of the vocabulary.
+    """
+
+    def __init__(self, max_edit_distance=2, min_word_length=5):
+        self.max_edit_distance = max_edit_distance
+        self.min_word_length = min_word_length
+        self.words = {}     # word -> frequency
+        self.targets = set()  # words a misspelt token may be corrected to
+        self.deletes = {}   # deleted variant -> list of target words
+
+    def add_word(self, word, count=1, target=True):
+        """Add a word (or bump its frequency); deletes are generated in build().
+
+        Words added with target=False are known (never corrected) but are
+        not offered as corrections.
+        """
+        word = word.lower()
+        if word:
+            self.words[word] = self.words.get(word, 0) + count
+            if target:
+                self.targets.add(word)
+
+    def add_text(self, text, count=1, target=True):
+        """Add every alphabetic token found in a piece of text"""
+        for word in re.findall(r'[a-z]+', str(text).lower()):
+            self.add_word(word, count, target)
+
+    def build(self):
+        """Generate the delete dictionary for the correction targets"""
+        self.deletes = {}
+        for word in self.targets:
+            for variant in self._delete_variants(word, self.max_edit_distance):
+                self.deletes.setdefault(variant, []).append(word)
+        return self
+
+    def _delete_variants(self, word, distance):
+        """All strings obtained by deleting up to `distance` characters (including the word)"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            next_frontier = set()
+            for candidate in frontier:
+                if len(candidate) <= 1:
+                    continue
+                for i in range(len(candidate)):
+                    next_frontier.add(candidate[:i] + candidate[i + 1:])
+            variants.update(next_frontier)
+            frontier = next_frontier
+        return variants
+
+    def max_distance_for(self, word):
+        """Allow fewer edits on short words, where one edit changes the meaning"""
+        return 1 if len(word) <= 7 else self.max_edit_distance
+
+    def lookup(self, word):
+        """Return the best correction for a single word, or None if it is fine or unknown"""
+        word = word.lower()
+        if (word in self.words or word in COMMON_WORDS
+                or len(word) < self.min_word_length or not word.isalpha()):
+            return None
+
+        max_distance = self.max_distance_for(word)
+        best = None
+        best_key = None
+        seen = set()
+        for variant in self._delete_variants(word, max_distance):
+            for candidate in self.deletes.get(variant, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(word, candidate, max_distance)
+                if distance > max_distance:
+                    continue
+                key = (distance, -self.words[candidate], candidate)
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+        return best
+
+    def correct(self, text):
+        """Correct each token of a query, returning (corrected_text, corrections)"""
+        corrections = []
+
+        def replace(match):
+            token = match.group(0)
+            suggestion = self.lookup(token)
+            if suggestion is None:
+                return token
+            corrections.append({'original': token, 'corrected': suggestion})
+            return suggestion
+
+        corrected = re.sub(r'[A-Za-z]+', replace, text)
+        return corrected, corrections
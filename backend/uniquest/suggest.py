@@ -0,0 +1,149 @@
+import bisect
+import heapq
+import re
+
+# Words skipped when building acronyms ("Vellore Institute of Technology" -> "VIT")
+ACRONYM_STOPWORDS = {'of', 'and', 'for', 'the', 'in', 'at', '&'}
+
+# Common short forms students type for well-known institute families
+COMMON_ABBREVIATIONS = {
+    'indian institute of technology': 'iit',
+    'national institute of technology': 'nit',
+    'indian institute of information technology': 'iiit',
+    'international institute of information technology': 'iiit',
+    'birla institute of technology': 'bit',
+    'vellore institute of technology': 'vit',
+}
+
+
+def clean_text(value):
+    """Collapse the embedded newlines and runs of spaces found in the CSV files"""
+    if value is None or value != value:  # None or NaN
+        return ""
+    return ' '.join(str(value).split())
+
+
+def clean_place(value, known_places=()):
+    """Clean a state/district value, repairing words split by the PDF export
+    (e.g. 'Maharasht\\n ra' -> 'Maharashtra') when they match a known place"""
+    text = clean_text(value)
+    if not text:
+        return ""
+    squashed = text.replace(' ', '').lower()
+    for place in known_places:
+        if place.replace(' ', '') == squashed:
+            return place.title()
+    return text if not text.isupper() else text.title()
+
+
+def make_acronym(name):
+    """Build an acronym from the initials of the significant words of a name"""
+    words = re.findall(r'[a-z]+', name.lower())
+    initials = ''.join(word[0] for word in words if word not in ACRONYM_STOPWORDS)
+    return initials if len(initials) >= 2 else ""
+
+
+def name_aliases(name):
+    """Return alternative lookup keys for a college name (acronyms and short forms)"""
+    lowered = clean_text(name).lower()
+    aliases = []
+    acronym = make_acronym(lowered)
+    if acronym:
+        aliases.append(acronym)
+    for long_form, short_form in COMMON_ABBREVIATIONS.items():
+        if lowered.startswith(long_form):
+            rest = lowered[len(long_form):].strip(' ,')
+            aliases.append(f"{short_form} {rest}".strip())
+    return aliases
+
+
+class SuggestionIndex:
+    """Prefix lookup over a sorted array of keys.
+
+    Each entry (college, course, district, city or state) is stored once and
+    reachable through one or more lowercase keys. Lookups use bisect on the
+    sorted key array, and the answers for very short prefixes (which match
+    large ranges) are precomputed so every keystroke stays well under a
+    millisecond.
+    """
+
+    SHORT_PREFIX_LENGTH = 3
+    MAX_LIMIT = 20
+
+    def __init__(self):
+        self.entries = {}   # (type, lowercase text) -> [text, type, score, extra keys]
+        self.keys = []
+        self.entry_ids = []
+        self.scores = []
+        self.texts = []
+        self.types = []
+        self.short_prefix_cache = {}
+
+    def add(self, text, entry_type, score, extra_keys=()):
+        """Register an entry, keeping the highest score seen for duplicates"""
+        text = clean_text(text)
+        if not text:
+            return
+        entry_key = (entry_type, text.lower())
+        entry = self.entries.get(entry_key)
+        if entry is None:
+            self.entries[entry_key] = [text, entry_type, score, set(extra_keys)]
+        else:
+            entry[2] = max(entry[2], score)
+            entry[3].update(extra_keys)
+
+    def build(self):
+        """Freeze the entries into sorted key arrays and the short-prefix cache"""
+        pairs = []
+        self.texts, self.types, self.scores = [], [], []
+        for entry_id, (text, entry_type, score, extra_keys) in enumerate(self.entries.values()):
+            self.texts.append(text)
+            self.types.append(entry_type)
+            self.scores.append(score)
+            keys = {text.lower()}
+            keys.update(key.lower() for key in extra_keys if key)
+            if entry_type == 'college':
+                # Let users start typing at any significant word ("madras" -> IIT Madras)
+                words = text.lower().split()
+                for position in range(1, len(words)):
+                    if len(words[position]) >= 3 and words[position] not in ACRONYM_STOPWORDS:
+                        keys.add(' '.join(words[position:]))
+            pairs.extend((key, entry_id) for key in keys)
+
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.entry_ids = [entry_id for _, entry_id in pairs]
+
+        # Precompute the best entries for every short prefix
+        self.short_prefix_cache = {}
+        by_score = sorted(range(len(pairs)), key=lambda i: -self.scores[self.entry_ids[i]])
+        for position in by_score:
+            key, entry_id = pairs[position]
+            for length in range(1, min(len(key), self.SHORT_PREFIX_LENGTH) + 1):
+                bucket = self.short_prefix_cache.setdefault(key[:length], [])
+                if len(bucket) < self.MAX_LIMIT and entry_id not in bucket:
+                    bucket.append(entry_id)
+        return self
+
+    def suggest(self, prefix, limit=8):
+        """Return up to `limit` entries whose keys start with `prefix`, most popular first"""
+        prefix = ' '.join(prefix.lower().split())
+        limit = max(1, min(int(limit), self.MAX_LIMIT))
+        if not prefix:
+            return []
+
+        if len(prefix) <= self.SHORT_PREFIX_LENGTH:
+            entry_ids = self.short_prefix_cache.get(prefix, [])[:limit]
+        else:
+            lo = bisect.bisect_left(self.keys, prefix)
+            hi = bisect.bisect_left(self.keys, prefix + '\uffff', lo)
+            candidates = set(self.entry_ids[lo:hi])
+            entry_ids = heapq.nsmallest(limit, candidates, key=lambda i: (-self.scores[i], self.texts[i]))
+
+        return [
+            {'text': self.texts[i], 'type': self.types[i], 'score': self.scores[i]}
+            for i in entry_ids
+        ]
+
+    def __len__(self):
+        return len(self.texts)
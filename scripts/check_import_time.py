@@ -0,0 +1,76 @@
+"""Import-time benchmark for the uniquest package.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+reports the cumulative import time of the module and fails when it exceeds
+the budget or when a heavy dependency is pulled in at import time.
+
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 100 --repeat 5
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+# Modules that must not be imported by `import uniquest`
+HEAVY_MODULES = ['pandas', 'numpy', 'flask', 'flask_cors']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module):
+    """Return {module name: cumulative microseconds} for one fresh import"""
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env, cwd=BACKEND_DIR,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr)
+
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='uniquest')
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help='Maximum cumulative import time (best of --repeat runs)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    timings = []
+    for _ in range(args.repeat):
+        cumulative = measure(args.module)
+        timings.append(cumulative.get(args.module, 0) / 1000.0)
+    best = min(timings)
+
+    heavy = sorted(name for name in cumulative if name.split('.')[0] in HEAVY_MODULES)
+    heavy_roots = sorted({name.split('.')[0] for name in heavy})
+
+    print(f"import {args.module}: best {best:.2f} ms over {args.repeat} runs "
+          f"(runs: {', '.join(f'{t:.2f}' for t in timings)}; budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy_roots:
+        print(f"FAIL: heavy modules imported at import time: {', '.join(heavy_roots)}")
+        failed = True
+    if best > args.budget_ms:
+        print(f"FAIL: import time {best:.2f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,8 @@
+#!/bin/sh
+# Checks run before merging: byte-compile everything and keep `import uniquest` cheap
+set -e
+cd "$(dirname "$0")/.."
+
+python -m compileall -q backend scripts
+python scripts/check_import_time.py --budget-ms 50
+python -m pytest -q backend/tests